@@ -0,0 +1,28 @@
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def install_memory_keyring():
+    # In-process keyring so benchmarks never touch (or unlock) the real one.
+    import keyring
+    from keyring.backend import KeyringBackend
+
+    class MemoryKeyring(KeyringBackend):
+        priority = 1
+        def __init__(self):
+            super().__init__()
+            self.store = {}
+        def get_password(self, service, username):
+            return self.store.get((service, username))
+        def set_password(self, service, username, password):
+            self.store[(service, username)] = password
+        def delete_password(self, service, username):
+            self.store.pop((service, username), None)
+
+    backend = MemoryKeyring()
+    keyring.set_keyring(backend)
+    return backend
@@ -0,0 +1,49 @@
+import asyncio, os, sys, tempfile, threading, time
+
+from _support import install_memory_keyring, percentile
+from ludos_agent import Agent
+from ludos_agent_client import Client
+from ludos_index import IndexStore
+from ludos_otp import random_secret
+from ludos_totp import APP, KeyringStore, service
+
+def start_agent(path, store):
+    ready = threading.Event()
+    agent = Agent(path, timeout=300, store=store)
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=lambda: loop.run_until_complete(agent.serve(ready.set)), daemon=True).start()
+    ready.wait()
+    return agent
+
+def run_clients(path, clients, requests, line):
+    latencies = [[] for _ in range(clients)]
+    def worker(out):
+        c = Client(path)
+        for _ in range(requests):
+            t = time.perf_counter()
+            c.request(line)
+            out.append(time.perf_counter() - t)
+        c.close()
+    threads = [threading.Thread(target=worker, args=(out,)) for out in latencies]
+    t = time.perf_counter()
+    for th in threads: th.start()
+    for th in threads: th.join()
+    wall = time.perf_counter() - t
+    return [x for l in latencies for x in l], wall
+
+if __name__ == "__main__":
+    labels = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    kr = install_memory_keyring()
+    with tempfile.TemporaryDirectory() as d:
+        index = IndexStore(os.path.join(d, "idx.db"), legacy_path=None)
+        for i in range(labels):
+            index.add(f"acct{i}")
+            kr.set_password(APP, service(f"acct{i}"), random_secret())
+        path = os.path.join(d, "agent.sock")
+        start_agent(path, KeyringStore(index))
+        Client(path).request("codes")  # warm the cache
+        for line in ["code acct0", "password 24 ulds", "codes"]:
+            for clients in (1, 8, 32):
+                lat, wall = run_clients(path, clients, requests // clients if line == "codes" else requests, line)
+                print(f"{line:<18} clients={clients:<3} p50={percentile(lat, 50)*1e6:7.0f}us p99={percentile(lat, 99)*1e6:7.0f}us  {len(lat)/wall:8.0f} req/s")
@@ -0,0 +1,48 @@
+import hashlib, os, resource, sys, tempfile, time
+
+from _support import percentile
+from ludos_breach import BreachChecker, build_bloom, build_index
+
+def write_dump(path, n):
+    # Synthetic HIBP-style dump: the SHA-1 of "pw<i>" for i < n, sorted, CRLF-terminated.
+    hashes = sorted(hashlib.sha1(f"pw{i}".encode()).hexdigest().upper() for i in range(n))
+    with open(path, "w", newline="") as f:
+        for i, h in enumerate(hashes):
+            f.write(f"{h}:{i % 997 + 1}\r\n")
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run(path, label, n, lookups):
+    checker = BreachChecker(path)
+    for kind, words in [("hit", [f"pw{i * 7919 % n}" for i in range(lookups)]), ("miss", [f"nope{i}" for i in range(lookups)])]:
+        lat = []
+        t = time.perf_counter()
+        for w in words:
+            s = time.perf_counter()
+            found = checker.count(w)
+            lat.append(time.perf_counter() - s)
+            assert (found > 0) == (kind == "hit"), w
+        total = time.perf_counter() - t
+        print(f"{label:<12} {kind:<4} {lookups/total:10.0f} lookups/s  p50 {percentile(lat, 50)*1e6:6.1f}us  p99 {percentile(lat, 99)*1e6:6.1f}us  rss {rss_mb():6.1f} MB")
+    checker.close()
+
+if __name__ == "__main__":
+    # usage: bench_breach.py [hashes in dump] [lookups]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "pwned.txt")
+        write_dump(path, n)
+        print(f"dump: {n} hashes, {os.path.getsize(path) / 1e6:.1f} MB")
+        run(path, "bisect", n, lookups)
+        t = time.perf_counter(); build_index(path)
+        print(f"index built in {time.perf_counter() - t:.2f}s")
+        run(path, "idx", n, lookups)
+        t = time.perf_counter(); build_bloom(path)
+        print(f"bloom built in {time.perf_counter() - t:.2f}s ({os.path.getsize(path + '.bloom') / 1e6:.1f} MB)")
+        run(path, "idx+bloom", n, lookups)
@@ -0,0 +1,48 @@
+import json, os, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ludos_index import IndexStore
+
+def legacy_ops(path, n):
+    # The pre-SQLite behaviour: full parse and full indent=2 rewrite per add/remove.
+    def load():
+        if not os.path.exists(path): return {}
+        with open(path, "r", encoding="utf-8") as f: return json.load(f)
+    def save(idx):
+        with open(path, "w", encoding="utf-8") as f: json.dump(idx, f, indent=2)
+    t = time.perf_counter()
+    for i in range(n):
+        idx = load(); idx[f"label{i}"] = {"created": "2024-01-01T00:00:00Z"}; save(idx)
+    add = time.perf_counter() - t
+    t = time.perf_counter()
+    for _ in range(100): list(load().items())
+    lst = (time.perf_counter() - t) / 100
+    t = time.perf_counter()
+    for i in range(0, n, 10):
+        idx = load(); del idx[f"label{i}"]; save(idx)
+    rem = time.perf_counter() - t
+    return add, rem, lst
+
+def store_ops(path, n):
+    store = IndexStore(path, legacy_path=None)
+    t = time.perf_counter()
+    for i in range(n): store.add(f"label{i}")
+    add = time.perf_counter() - t
+    t = time.perf_counter()
+    for _ in range(100): store.items()
+    lst = (time.perf_counter() - t) / 100
+    t = time.perf_counter()
+    for i in range(0, n, 10): store.remove(f"label{i}")
+    rem = time.perf_counter() - t
+    store.close()
+    return add, rem, lst
+
+if __name__ == "__main__":
+    # usage: bench_index.py [labels] [legacy labels]; the JSON path is quadratic in the
+    # number of adds (about 4 minutes at 10k), so it defaults to a smaller run.
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    legacy_n = int(sys.argv[2]) if len(sys.argv) > 2 else min(n, 2000)
+    with tempfile.TemporaryDirectory() as d:
+        for name, fn, path, n in [("json", legacy_ops, os.path.join(d, "idx.json"), legacy_n), ("sqlite", store_ops, os.path.join(d, "idx.db"), n)]:
+            add, rem, lst = fn(path, n)
+            print(f"{name:<7} add {n}: {add:8.3f}s ({add/n*1e6:8.1f}us/op)  remove {n//10}: {rem:7.3f}s ({rem/(n//10)*1e6:8.1f}us/op)  list: {lst*1e3:7.2f}ms")
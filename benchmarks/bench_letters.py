@@ -0,0 +1,47 @@
+import csv, os, sys, tempfile, textwrap, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ludos_letters import read_rows, render_rows, write_letters
+
+def legacy_erasure(name, email, identifiers, law):
+    # The original renderer: f-string plus textwrap.dedent on every call.
+    body = f"""
+Hello,
+
+I am exercising my right to deletion under {law}. Please delete all personal data related to me across your systems, including backups when feasible, and confirm completion.
+
+Identifiers:
+{os.linesep.join(identifiers)}
+
+Contact:
+Name: {name}
+Email: {email}
+
+Please confirm receipt and completion within the statutory period and describe any data you are legally required to retain.
+"""
+    return textwrap.dedent(body).strip()
+
+def make_csv(path, n):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["kind", "name", "email", "identifiers", "law"])
+        for i in range(n):
+            w.writerow(["erasure", f"Client {i}", f"client{i}@example.com", f"+1555{i:07d};client{i}", "GDPR"])
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "rows.csv")
+        make_csv(src, n)
+        t = time.perf_counter()
+        for i in range(n): legacy_erasure(f"Client {i}", f"client{i}@example.com", [f"+1555{i:07d}", f"client{i}"], "GDPR")
+        old = time.perf_counter() - t
+        t = time.perf_counter()
+        for _ in render_rows(read_rows(src)): pass
+        new = time.perf_counter() - t
+        print(f"render {n}: dedent per call {old:.2f}s ({n/old:.0f}/s), template {new:.2f}s ({n/new:.0f}/s, includes CSV parsing)")
+        for out, label in [(os.path.join(d, "out"), "directory"), (os.path.join(d, "out.zip"), "zip")]:
+            t = time.perf_counter()
+            write_letters(render_rows(read_rows(src)), out)
+            dt = time.perf_counter() - t
+            print(f"write {n} to {label}: {dt:.2f}s ({n/dt:.0f} letters/s)")
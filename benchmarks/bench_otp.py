@@ -0,0 +1,31 @@
+import sys, time
+
+import _support  # noqa: F401  (puts the repo root on sys.path)
+from ludos_otp import Otp, batch, random_secret
+
+if __name__ == "__main__":
+    labels = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    drift = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    keys = {f"acct{i}": random_secret() for i in range(labels)}
+    now = time.time()
+    steps = range(-drift, drift + 1)
+    n = labels * len(steps)
+    try:
+        import pyotp
+        t = time.perf_counter()
+        for s in keys.values():
+            for step in steps: pyotp.TOTP(s).at(now, step)
+        old = time.perf_counter() - t
+        print(f"pyotp (new TOTP per code): {n/old:10.0f} codes/s")
+    except ImportError:
+        print("pyotp not installed; skipping comparison")
+    otps = {k: Otp(s) for k, s in keys.items()}
+    t = time.perf_counter()
+    for otp in otps.values():
+        for step in steps: otp.at(now, step)
+    single = time.perf_counter() - t
+    t = time.perf_counter()
+    batch(otps, now, steps)
+    many = time.perf_counter() - t
+    print(f"Otp.at (cached HMAC):      {n/single:10.0f} codes/s")
+    print(f"batch ({labels} labels x {len(steps)} steps): {n/many:10.0f} codes/s")
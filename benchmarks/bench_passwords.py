@@ -0,0 +1,19 @@
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ludos_passwords import strong_password, strong_passwords
+
+def bench(n=20000, length=24, opts=(True, True, True, True)):
+    t = time.perf_counter()
+    for _ in range(n): strong_password(length, *opts)
+    old = time.perf_counter() - t
+    t = time.perf_counter()
+    for _ in strong_passwords(n, length, *opts): pass
+    new = time.perf_counter() - t
+    return old, new
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for length, opts, name in [(24, (True, True, True, True), "ulds"), (64, (True, True, True, True), "ulds"), (6, (False, False, True, False), "d")]:
+        old, new = bench(n, length, opts)
+        print(f"len={length:<3} classes={name:<5} strong_password: {n/old:>10.0f}/s  strong_passwords: {n/new:>10.0f}/s  speedup x{old/new:.1f}")
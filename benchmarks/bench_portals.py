@@ -0,0 +1,79 @@
+import json, os, random, sys, tempfile, time
+
+from _support import percentile
+from ludos_portals import CATEGORIES, Registry
+
+SYLLABLES = ["peo", "ple", "find", "search", "data", "track", "look", "up", "trace", "info", "fast", "true", "check", "spy", "net", "base", "zab", "rad", "aris", "verify"]
+REGIONS = ["us", "ca", "uk", "eu", "de", "fr", "au", "global"]
+TAGS = ["people-search", "phone", "address", "background-check", "social", "ccpa", "gdpr", "marketing", "property", "email"]
+
+def synthetic(n, seed=1):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        name = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))).capitalize()
+        out.append({"key": f"{name.lower()}_{i}", "name": name, "url": f"https://www.{name.lower()}{i}.com/opt-out",
+                    "category": rnd.choice(list(CATEGORIES)), "regions": rnd.sample(REGIONS, rnd.randint(1, 2)),
+                    "tags": rnd.sample(TAGS, rnd.randint(1, 3))})
+    return out
+
+def typo(word, rnd):
+    i = rnd.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+def bench_gui(reg):
+    # One CTkButton per entry (the old tab) against the virtualized list; needs a display.
+    try:
+        import customtkinter as ctk
+        from ludos_gui import PortalList
+        root = ctk.CTk()
+    except Exception as e:
+        print(f"tab build: skipped ({e.__class__.__name__}: {e})")
+        return
+    for label, build in [("virtualized", lambda f: PortalList(f).set_items(list(reg))),
+                         ("button per entry", lambda f: [ctk.CTkButton(f, text=p.name).pack() for p in reg])]:
+        frame = ctk.CTkFrame(root)
+        t = time.perf_counter()
+        build(frame)
+        root.update()
+        print(f"tab build ({label}): {(time.perf_counter() - t) * 1e3:9.1f} ms")
+        frame.destroy()
+    root.destroy()
+
+if __name__ == "__main__":
+    # usage: bench_portals.py [entries] [queries] [--no-gui]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    q = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rnd = random.Random(2)
+    entries = synthetic(n)
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "portals.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        t = time.perf_counter()
+        reg = Registry.load(path)
+        print(f"load {n} entries: {(time.perf_counter() - t) * 1e3:.1f} ms")
+    t = time.perf_counter()
+    reg.search("")
+    print(f"index build: {(time.perf_counter() - t) * 1e3:.1f} ms ({len(reg.vocab)} tokens)")
+    t = time.perf_counter()
+    reg.search("zzqx")
+    print(f"typo index build (first fuzzy query): {(time.perf_counter() - t) * 1e3:.1f} ms ({len(reg.variants)} variants)")
+    words = [e["name"].lower() for e in entries]
+    kinds = {
+        "1-char prefix": lambda: rnd.choice(words)[:1],
+        "3-char prefix": lambda: rnd.choice(words)[:3],
+        "full name": lambda: rnd.choice(words),
+        "two terms": lambda: f"{rnd.choice(words)[:4]} {rnd.choice(REGIONS)}",
+        "typo": lambda: typo(rnd.choice(words), rnd),
+    }
+    for kind, make in kinds.items():
+        lat, hits = [], 0
+        for _ in range(q):
+            query = make()
+            s = time.perf_counter()
+            hits += len(reg.search(query))
+            lat.append(time.perf_counter() - s)
+        print(f"{kind:<14} p50 {percentile(lat, 50)*1e3:7.3f} ms  p99 {percentile(lat, 99)*1e3:7.3f} ms  avg hits {hits/q:8.1f}")
+    if "--no-gui" not in sys.argv:
+        bench_gui(reg)
@@ -0,0 +1,24 @@
+import os, sys, tempfile, time
+
+import _support  # noqa: F401  (puts the repo root on sys.path)
+from ludos_reuse import ScalableBloom
+
+if __name__ == "__main__":
+    # usage: bench_reuse.py [passwords issued] [unseen probes] [fp rate]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    probes = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    fp = float(sys.argv[3]) if len(sys.argv) > 3 else 1e-4
+    with tempfile.TemporaryDirectory() as d:
+        f = ScalableBloom(os.path.join(d, "issued.bloom"), fp=fp)
+        t = time.perf_counter()
+        for i in range(n): f.add(f"issued-{i}")
+        add = time.perf_counter() - t
+        t = time.perf_counter()
+        assert all(f"issued-{i}" in f for i in range(0, n, max(1, n // probes)))
+        hits = sum(f"fresh-{i}" in f for i in range(probes))
+        check = time.perf_counter() - t
+        st = f.stats()
+        f.close()
+    print(f"add {n}: {n/add:9.0f}/s   check: {2*probes/check:9.0f}/s")
+    print(f"{st['stages']} stages, {st['bytes']/1e6:.2f} MB ({st['bytes']/n:.2f} bytes/password)")
+    print(f"false positives: configured <= {fp:.0e}, estimated {st['fp_estimate']:.2e}, measured {hits/probes:.2e} ({hits}/{probes})")
@@ -0,0 +1,39 @@
+import os, sys, tempfile, time
+
+from _support import install_memory_keyring
+from ludos_index import IndexStore
+from ludos_otp import random_secret
+from ludos_totp import KeyringStore
+from ludos_vault import Vault, migrate
+
+def slow(backend, latency):
+    # Simulates per-call keyring cost (Secret Service over D-Bus is typically 5-50 ms).
+    get = backend.get_password
+    def get_password(service, username):
+        time.sleep(latency)
+        return get(service, username)
+    backend.get_password = get_password
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.005
+    kr = install_memory_keyring()
+    for n in (1, 100, 5000):
+        with tempfile.TemporaryDirectory() as d:
+            source = KeyringStore(IndexStore(os.path.join(d, "idx.db"), legacy_path=None))
+            for i in range(n):
+                source.put(f"acct{i}", random_secret())
+            vault_path = os.path.join(d, "vault.bin")
+            migrate(vault_path, source)
+            slow(kr, latency)
+            t = time.perf_counter()
+            store = KeyringStore(source.index)
+            secrets = {label: store.get(label) for label in store.labels()}
+            keyring_s = time.perf_counter() - t
+            t = time.perf_counter()
+            vault = Vault.unlock(vault_path)
+            vsecrets = {label: vault.get(label) for label in vault.labels()}
+            vault_s = time.perf_counter() - t
+            assert secrets == vsecrets
+            kr.get_password = type(kr).get_password.__get__(kr)
+            kr.delete_password("ludos-gui", "ludos-gui:vault-key")
+            print(f"{n:>5} labels: keyring {keyring_s*1000:9.1f} ms ({store.round_trips} round trips)   vault {vault_s*1000:7.1f} ms ({vault.round_trips} round trip)")
@@ -0,0 +1,241 @@
+import argparse, fnmatch, json, os, platform, shutil, subprocess, sys, tempfile, time
+
+import _support
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Headless suite over the core paths at realistic scales. HOME is pointed at a temporary
+# directory and keyring at an in-memory backend *before* any ludos module is imported,
+# since their default paths are resolved at import. Results can be written as JSON and
+# compared against a previous run:
+#
+#   python benchmarks/run_all.py --json base.json
+#   python benchmarks/run_all.py --compare base.json        # exit 1 on a regression
+#
+# Each case reports per-operation time; --repeat keeps the best of several runs.
+
+CASES = []
+
+def case(name, n, quick):
+    def register(fn):
+        CASES.append((name, n, quick, fn))
+        return fn
+    return register
+
+def clock(fn):
+    # (seconds, extra fields) for one call of fn.
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t, {}
+
+@case("passwords.strong_password", 20000, 2000)
+def _(n, tmp):
+    from ludos_passwords import strong_password
+    return clock(lambda: [strong_password(24) for _ in range(n)])
+
+@case("passwords.strong_passwords", 200000, 20000)
+def _(n, tmp):
+    from ludos_passwords import strong_passwords
+    return clock(lambda: sum(1 for _ in strong_passwords(n, 24)))
+
+@case("letters.dmca_letter", 100000, 10000)
+def _(n, tmp):
+    from ludos_letters import dmca_letter
+    urls = [f"https://example.com/copy/{i}" for i in range(5)]
+    return clock(lambda: [dmca_letter("Jane Doe", "jane@example.com", urls, "my photo", "Jane Doe", "2024-01-01") for _ in range(n)])
+
+@case("letters.privacy_erasure_letter", 100000, 10000)
+def _(n, tmp):
+    from ludos_letters import privacy_erasure_letter
+    ids = ["jane@example.com", "+1 555 0100", "@jane"]
+    return clock(lambda: [privacy_erasure_letter("Jane Doe", "jane@example.com", ids, "GDPR Art. 17", "Broker") for _ in range(n)])
+
+@case("letters.write_letters", 20000, 2000)
+def _(n, tmp):
+    from ludos_letters import privacy_erasure_letter, write_letters
+    letter = privacy_erasure_letter("Jane Doe", "jane@example.com", ["jane@example.com"], "GDPR")
+    return clock(lambda: write_letters(((f"erasure_{i:06d}", letter) for i in range(n)), os.path.join(tmp, "letters")))
+
+@case("index.add", 10000, 1000)
+def _(n, tmp):
+    from ludos_index import IndexStore
+    store = IndexStore(os.path.join(tmp, "index.db"), legacy_path=None)
+    try:
+        return clock(lambda: [store.add(f"label{i}") for i in range(n)])
+    finally:
+        store.close()
+
+@case("index.items", 100, 10)
+def _(n, tmp):
+    # n full listings of a 10k-label index, as the TOTP list does.
+    from ludos_index import IndexStore
+    store = IndexStore(os.path.join(tmp, "index.db"), legacy_path=None)
+    for i in range(10000): store.add(f"label{i}")
+    try:
+        return clock(lambda: [dict(store.items()) for _ in range(n)])
+    finally:
+        store.close()
+
+@case("index.migrate_legacy", 10000, 1000)
+def _(n, tmp):
+    from ludos_index import IndexStore
+    legacy = os.path.join(tmp, "index.json")
+    with open(legacy, "w", encoding="utf-8") as f:
+        json.dump({f"label{i}": {"created": "2024-01-01T00:00:00Z"} for i in range(n)}, f, indent=2)
+    return clock(lambda: IndexStore(os.path.join(tmp, "migrated.db"), legacy_path=legacy).close())
+
+@case("keyring.put", 2000, 200)
+def _(n, tmp):
+    from ludos_index import IndexStore
+    from ludos_otp import random_secret
+    from ludos_totp import KeyringStore
+    store = KeyringStore(IndexStore(os.path.join(tmp, "kr.db"), legacy_path=None))
+    secrets = [random_secret() for _ in range(n)]
+    try:
+        return clock(lambda: [store.put(f"label{i}", s) for i, s in enumerate(secrets)])
+    finally:
+        store.index.close()
+
+@case("totp.cold_prefetch", 2000, 200)
+def _(n, tmp):
+    # The TOTP list after unlock: one keyring read per label, then all codes.
+    from ludos_index import IndexStore
+    from ludos_otp import random_secret
+    from ludos_totp import KeyringStore, SecretCache
+    store = KeyringStore(IndexStore(os.path.join(tmp, "cold.db"), legacy_path=None))
+    for i in range(n): store.put(f"label{i}", random_secret())
+    labels = store.labels()
+    cache = SecretCache(store)
+    try:
+        t, _ = clock(lambda: (cache.prefetch(labels), cache.codes(labels, time.time())))
+        return t, {"round_trips": store.round_trips}
+    finally:
+        store.index.close()
+
+@case("totp.warm_codes", 200000, 20000)
+def _(n, tmp):
+    # n codes from already-unlocked secrets, in refreshes of 1000 labels.
+    from ludos_index import IndexStore
+    from ludos_otp import random_secret
+    from ludos_totp import KeyringStore, SecretCache
+    store = KeyringStore(IndexStore(os.path.join(tmp, "warm.db"), legacy_path=None))
+    for i in range(1000): store.put(f"label{i}", random_secret())
+    labels = store.labels()
+    cache = SecretCache(store)
+    cache.prefetch(labels)
+    now = time.time()
+    try:
+        return clock(lambda: [cache.codes(labels, now + 30 * k) for k in range(n // 1000)])
+    finally:
+        store.index.close()
+
+@case("rotation.fire", 10000, 1000)
+def _(n, tmp):
+    # n rotations across 100 schedules through the rotation log and the reuse guard,
+    # driven by RotationScheduler.tick() with a fake clock.
+    from ludos_reuse import ReuseGuard
+    from ludos_rotation import RotationScheduler
+    from ludos_rotlog import RotationLogs
+    logs = RotationLogs(os.path.join(tmp, "rot"), legacy_path=None)
+    now = [1.7e9]
+    sched = RotationScheduler(path=os.path.join(tmp, "schedules.json"), sink=logs, guard=ReuseGuard(logs), clock=lambda: now[0])
+    for i in range(100): sched.add(f"s{i}", 1, 20, (True, True, True, False))
+    def run():
+        for _ in range(n // 100):
+            sched.tick()
+            now[0] += 3600
+    try:
+        return clock(run)
+    finally:
+        sched.guard.close()
+        logs.close()
+
+@case("rotlog.active_at", 100000, 10000)
+def _(n, tmp):
+    import random
+    from ludos_rotlog import RotationLog
+    log = RotationLog(os.path.join(tmp, "lookup"))
+    for i in range(100000): log.append(1.7e9 + i * 60, f"pw{i}")
+    log.sync()
+    rnd = random.Random(1)
+    times = [1.7e9 + rnd.random() * 6e6 for _ in range(n)]
+    try:
+        return clock(lambda: [log.active_at(t) for t in times])
+    finally:
+        log.close()
+
+def git_commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True).stdout.strip())
+        return sha, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    worse = 0
+    print(f"\nvs {baseline_path} ({(base['meta'].get('commit') or '?')[:10]}):")
+    for name, r in results.items():
+        b = base["results"].get(name)
+        if not b: continue
+        ratio = r["per_op_us"] / b["per_op_us"]
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        worse += bool(flag)
+        print(f"  {name:<34} {b['per_op_us']:10.2f} -> {r['per_op_us']:10.2f} us/op  x{ratio:5.2f}{flag}")
+    return worse
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Run the Ludos benchmark suite headless.")
+    p.add_argument("--quick", action="store_true", help="about a tenth of the default sizes")
+    p.add_argument("--only", action="append", metavar="GLOB", help="run only matching cases, e.g. 'letters.*' (repeatable)")
+    p.add_argument("--repeat", type=int, default=1, help="keep the best of this many runs per case")
+    p.add_argument("--json", metavar="FILE", help="write results as JSON")
+    p.add_argument("--compare", metavar="FILE", help="compare with an earlier --json file; exit 1 on a regression")
+    p.add_argument("--threshold", type=float, default=0.15, help="slowdown counted as a regression (default: %(default)s = 15%%)")
+    p.add_argument("--metrics", action="store_true", help="run with ludos_metrics enabled and print its summary (shows the overhead too)")
+    args = p.parse_args(argv)
+
+    home = tempfile.mkdtemp(prefix="ludos-bench-home-")
+    try:
+        return _run(args, home)
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+def _run(args, home):
+    os.environ["HOME"] = home
+    for var in ("LUDOS_METRICS", "LUDOS_BREACH_DB", "LUDOS_PORTALS", "LUDOS_AGENT_SOCK"):
+        os.environ.pop(var, None)
+    _support.install_memory_keyring()
+    import ludos_metrics
+    if args.metrics: ludos_metrics.enable()
+
+    results = {}
+    for name, n, quick, fn in CASES:
+        if args.only and not any(fnmatch.fnmatch(name, g) for g in args.only):
+            continue
+        n = quick if args.quick else n
+        best = None
+        for _ in range(max(1, args.repeat)):
+            with tempfile.TemporaryDirectory(dir=home) as tmp:
+                seconds, extra = fn(n, tmp)
+            if best is None or seconds < best[0]:
+                best = (seconds, extra)
+        seconds, extra = best
+        results[name] = {"n": n, "seconds": seconds, "per_op_us": seconds / n * 1e6, "ops_per_s": n / seconds, **extra}
+        print(f"{name:<34} n={n:<7} {seconds:8.3f}s {seconds / n * 1e6:10.2f} us/op {n / seconds:12.0f}/s", flush=True)
+
+    sha, dirty = git_commit()
+    meta = {"commit": sha, "dirty": dirty, "time": time.time(), "python": platform.python_version(),
+            "platform": platform.platform(), "quick": args.quick, "repeat": args.repeat, "metrics": args.metrics}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    status = 0
+    if args.compare:
+        status = 1 if compare(results, args.compare, args.threshold) else 0
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
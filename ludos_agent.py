@@ -0,0 +1,125 @@
+import argparse, asyncio, os, sys, time
+
+from ludos_agent_client import SOCKET_PATH, AgentError, ping
+from ludos_metrics import enable as enable_metrics, span
+from ludos_passwords import Entropy, parse_classes, strong_passwords
+from ludos_totp import SecretCache, load_keyring
+from ludos_vault import LazyStore
+
+class Agent:
+    # Serves TOTP codes and passwords on a 0600 Unix socket (protocol in
+    # ludos_agent_client.py). Otp objects (keyed HMAC state) stay warm in a SecretCache that is dropped
+    # after `timeout` idle seconds; keyring reads run in a worker thread, so warm requests
+    # never leave the event loop.
+    def __init__(self, path=SOCKET_PATH, timeout=300, store=None):
+        self.path = path
+        self.store = store if store is not None else LazyStore()
+        self.cache = SecretCache(self.store, timeout)
+        self.entropy = Entropy()
+        self.requests = 0
+
+    async def dispatch(self, line):
+        cmd, _, arg = line.strip().partition(" ")
+        if cmd == "ping":
+            return ["pong"]
+        if cmd == "lock":
+            self.cache.clear()
+            return []
+        if cmd == "password":
+            parts = arg.split()
+            if not parts or not parts[0].isdigit():
+                raise AgentError("usage: password <length> [classes]")
+            opts = parse_classes(parts[1] if len(parts) > 1 else "ulds")
+            return [next(strong_passwords(1, int(parts[0]), *opts, entropy=self.entropy))]
+        if cmd in ("code", "codes"):
+            if cmd == "code" and not arg:
+                raise AgentError("usage: code <label>")
+            self.cache.touch()
+            if cmd == "codes":
+                if load_keyring() is None:
+                    raise AgentError("Install: pip install keyring")
+                labels = await asyncio.get_running_loop().run_in_executor(None, self.store.labels)
+            else:
+                labels = [arg]
+            if self.cache.missing(labels):
+                if load_keyring() is None:
+                    raise AgentError("Install: pip install keyring")
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, self.cache.prefetch, labels)
+                except Exception as e:
+                    raise AgentError(f"keyring: {e}")
+            codes = self.cache.codes(labels, time.time())
+            if cmd == "code":
+                if arg not in codes:
+                    raise AgentError(f"no secret stored for '{arg}'")
+                return [codes[arg]]
+            return [f"{label}\t{code}" for label, code in codes.items()]
+        raise AgentError(f"unknown request '{cmd}'")
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.requests += 1
+                try:
+                    with span("agent.request"):
+                        lines = await self.dispatch(line.decode("utf-8"))
+                    reply = "".join(f"{l}\n" for l in [f"OK {len(lines)}"] + lines)
+                except (AgentError, ValueError) as e:
+                    reply = f"ERR {e}\n"
+                writer.write(reply.encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def expire(self):
+        while True:
+            await asyncio.sleep(max(1.0, min(self.cache.timeout or 60, 60) / 4))
+            if self.cache.idle():
+                self.cache.clear()
+
+    async def serve(self, ready=None):
+        if os.path.exists(self.path):
+            if ping(self.path):
+                raise AgentError(f"an agent is already listening on {self.path}")
+            os.unlink(self.path)
+        old = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(self.handle, path=self.path)
+        finally:
+            os.umask(old)
+        os.chmod(self.path, 0o600)
+        expiry = asyncio.ensure_future(self.expire())
+        if ready: ready()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Ludos agent: TOTP codes and passwords over a Unix socket.")
+    p.add_argument("--socket", default=SOCKET_PATH)
+    p.add_argument("--lock-timeout", type=float, default=300, help="drop cached secrets after this many idle seconds (0 = never)")
+    p.add_argument("--metrics", action="store_true", help="time requests and keyring calls and print a summary to stderr at exit (also: LUDOS_METRICS=1)")
+    p.add_argument("--metrics-file", metavar="FILE", help="like --metrics, but append the numbers to FILE as one JSON line (also: LUDOS_METRICS=FILE)")
+    args = p.parse_args(argv)
+    if args.metrics or args.metrics_file:
+        enable_metrics(args.metrics_file)
+    try:
+        asyncio.run(Agent(args.socket, args.lock_timeout).serve())
+    except AgentError as e:
+        print(f"ludos-agent: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import os, socket, sys
+
+# Kept free of asyncio and the ludos modules so that each call costs little more than
+# interpreter startup. Protocol, one request per line:
+#   ping | code <label> | codes | password <length> [classes] | lock
+# Each reply is "OK <n>" followed by n lines, or "ERR <message>".
+SOCKET_PATH = os.environ.get("LUDOS_AGENT_SOCK") or os.path.join(os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser("~"), ".ludos_agent.sock")
+
+class AgentError(Exception):
+    pass
+
+class Client:
+    # Blocking client; keep one instance around to reuse the connection.
+    def __init__(self, path=SOCKET_PATH):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.file = self.sock.makefile("rb")
+
+    def request(self, line):
+        self.sock.sendall(line.strip().encode("utf-8") + b"\n")
+        head = self.file.readline().decode("utf-8").rstrip("\n")
+        status, _, rest = head.partition(" ")
+        if status != "OK":
+            raise AgentError(rest or "agent closed the connection")
+        return [self.file.readline().decode("utf-8").rstrip("\n") for _ in range(int(rest))]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+def ping(path=SOCKET_PATH):
+    try:
+        c = Client(path)
+    except OSError:
+        return False
+    try:
+        return c.request("ping") == ["pong"]
+    except (OSError, AgentError):
+        return False
+    finally:
+        c.close()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print("usage: ludos_agent_client.py code <label> | codes | password <length> [classes] | lock | ping")
+        return 0
+    try:
+        c = Client()
+    except OSError as e:
+        print(f"ludos-agent: cannot reach agent at {SOCKET_PATH} ({e.strerror}); start it with: python ludos_agent.py", file=sys.stderr)
+        return 2
+    try:
+        for line in c.request(" ".join(argv)):
+            print(line)
+    except AgentError as e:
+        print(f"ludos-agent: {e}", file=sys.stderr)
+        return 1
+    finally:
+        c.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import hashlib, mmap, os, struct
+from array import array
+
+HOME = os.path.expanduser("~")
+BREACH_PATH = os.environ.get("LUDOS_BREACH_DB") or os.path.join(HOME, ".ludos_pwned_sha1.txt")
+PREFIX_BITS = 20
+BLOOM_HEADER = struct.Struct("<8sQQQ")   # magic, bits, hashes, items
+BLOOM_MAGIC = b"LUDOSBF1"
+
+def sha1_hex(password):
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper().encode("ascii")
+
+def _bloom_positions(digest, m, k):
+    # Double hashing over two independent 64-bit slices of the SHA-1 digest.
+    h1 = int.from_bytes(digest[0:8], "big")
+    h2 = int.from_bytes(digest[8:16], "big") | 1
+    return [(h1 + i * h2) % m for i in range(k)]
+
+def build_index(path, out=None):
+    # One streaming pass over the dump, recording the byte offset at which each 20-bit
+    # (5 hex digit) prefix starts: 2**20 + 1 little-endian uint64 offsets, 8 MiB total.
+    out = out or path + ".idx"
+    offsets = array("Q", [0]) * ((1 << PREFIX_BITS) + 1)
+    nxt, pos = 0, 0
+    with open(path, "rb") as f:
+        for line in f:
+            p = int(line[:5], 16)
+            while nxt <= p:
+                offsets[nxt] = pos
+                nxt += 1
+            pos += len(line)
+    while nxt <= 1 << PREFIX_BITS:
+        offsets[nxt] = pos
+        nxt += 1
+    with open(out, "wb") as f:
+        offsets.tofile(f)
+    return out
+
+def build_bloom(path, fp_rate=0.001, out=None):
+    # Sized for the number of lines in the dump; needs m/8 bytes of RAM while building
+    # (about 1.5 GB for the full ~900M-hash HIBP list at 0.1%).
+    import math
+    out = out or path + ".bloom"
+    with open(path, "rb") as f:
+        n = sum(1 for _ in f)
+    m = max(64, int(-n * math.log(fp_rate) / (math.log(2) ** 2)))
+    k = max(1, round(m / max(n, 1) * math.log(2)))
+    bits = bytearray((m + 7) // 8)
+    with open(path, "rb") as f:
+        for line in f:
+            for b in _bloom_positions(bytes.fromhex(line[:40].decode("ascii")), m, k):
+                bits[b >> 3] |= 1 << (b & 7)
+    with open(out, "wb") as f:
+        f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, m, k, n))
+        f.write(bits)
+    return out
+
+class BreachChecker:
+    # Looks up SHA-1 hashes in a HIBP "ordered by hash" dump (HASH:COUNT lines) by binary
+    # search over an mmap of the file, so resident memory stays at the pages touched.
+    # Optional sidecars: <dump>.idx narrows the search to one 20-bit prefix bucket, and
+    # <dump>.bloom answers most misses without touching the dump at all.
+    def __init__(self, path=BREACH_PATH):
+        self.path = path
+        self.maps = []
+        self.index = self.bloom = None
+        try:
+            self.mm = self._map(path)
+            if os.path.exists(path + ".idx"):
+                self.index = memoryview(self._map(path + ".idx")).cast("Q")
+            if os.path.exists(path + ".bloom"):
+                self.bloom = self._map(path + ".bloom")
+                magic, self.m, self.k, _ = BLOOM_HEADER.unpack_from(self.bloom)
+                if magic != BLOOM_MAGIC:
+                    raise ValueError(f"{path}.bloom is not a Ludos Bloom filter")
+        except BaseException:
+            self.close()
+            raise
+
+    def _map(self, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:   # mmap refuses empty files
+                raise ValueError(f"{path}: empty dump" if path == self.path else f"{path} is empty")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.maps.append(mm)
+        return mm
+
+    def close(self):
+        if self.index is not None: self.index.release()
+        self.index = None
+        for mm in self.maps: mm.close()
+        self.maps.clear()
+
+    def count_hash(self, target):
+        # target: 40 upper-case hex bytes. Returns the breach count, 0 if absent.
+        if self.bloom is not None:
+            base = BLOOM_HEADER.size
+            for b in _bloom_positions(bytes.fromhex(target.decode("ascii")), self.m, self.k):
+                if not self.bloom[base + (b >> 3)] & (1 << (b & 7)):
+                    return 0
+        mm = self.mm
+        if self.index is not None:
+            p = int(target[:5], 16)
+            lo, hi = self.index[p], self.index[p + 1]
+        else:
+            lo, hi = 0, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            s = mm.rfind(b"\n", lo, mid) + 1 or lo
+            e = mm.find(b"\n", s, hi)
+            if e < 0: e = hi
+            h = mm[s:s + 40]
+            if h == target:
+                try:
+                    return int(mm[s + 41:e].strip() or 1)
+                except ValueError:
+                    return 1
+            if h < target:
+                lo = e + 1
+            else:
+                hi = s
+        return 0
+
+    def count(self, password):
+        return self.count_hash(sha1_hex(password))
+
+_checker = None
+
+def default_checker():
+    # The shared checker for BREACH_PATH, or None when no dump is installed.
+    global _checker
+    if _checker is None and os.path.exists(BREACH_PATH):
+        _checker = BreachChecker(BREACH_PATH)
+    return _checker
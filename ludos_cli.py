@@ -0,0 +1,230 @@
+import argparse, sys
+from datetime import datetime, timezone
+
+from ludos_breach import BREACH_PATH, BreachChecker, build_bloom, build_index
+from ludos_launcher import Launcher
+from ludos_letters import read_rows, render_rows, write_letters
+from ludos_links import LinkChecker, all_portals, badge
+from ludos_metrics import enable as enable_metrics, span
+from ludos_passwords import parse_classes, strong_passwords
+from ludos_portals import CATEGORIES, default_registry
+from ludos_reuse import ReuseGuard
+from ludos_rotlog import RotationLogs
+from ludos_vault import VAULT_PATH, Vault, VaultError, migrate
+
+def cmd_passwords(args):
+    opts = parse_classes(args.classes)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for pw in strong_passwords(args.count, args.length, *opts):
+            out.write(pw + "\n")
+    finally:
+        if out is not sys.stdout: out.close()
+    return 0
+
+def cmd_letters(args):
+    progress = None if args.quiet else (lambda n: print(f"\r{n} letters", end="", file=sys.stderr, flush=True))
+    n = write_letters(render_rows(read_rows(args.input, args.format), args.brokers), args.output, args.workers, progress)
+    if not args.quiet: print(file=sys.stderr)
+    print(f"wrote {n} letters to {args.output}")
+    return 0
+
+def cmd_links(args):
+    portals = all_portals()
+    names = {url: key for key, url in portals.items()}
+    checker = LinkChecker(ttl=args.ttl * 3600, workers=args.workers, timeout=args.timeout)
+    try:
+        results = checker.check(args.urls or portals.values())
+    finally:
+        checker.close()
+    for url, r in sorted(results.items(), key=lambda kv: (badge(kv[1]) == "ok", names.get(kv[0], kv[0]))):
+        detail = r.get("error") or r.get("status")
+        moved = f" -> {r['final_url']}" if r.get("final_url") not in (None, url) else ""
+        print(f"{badge(r):<8} {detail!s:<6} {names.get(url, url)}{moved}{' (cached)' if r.get('cached') else ''}")
+    print(f"{len(results)} links, {checker.requests} requests")
+    return 1 if any(badge(r) == "dead" for r in results.values()) else 0
+
+def cmd_portals(args):
+    launcher = Launcher(interval=args.interval, browser=args.browser,
+                        progress=lambda key, ok: print(f"{'opened' if ok else 'FAILED':<7}{key}", flush=True))
+    if args.reset:
+        launcher.reset()
+    if args.resume:
+        n = launcher.resume()
+    else:
+        hits = default_registry().search(" ".join(args.query), args.category)
+        if not args.open:
+            for p in hits:
+                when = launcher.opened_at(p.key)
+                seen = datetime.fromtimestamp(when, timezone.utc).isoformat(timespec="seconds") if when else "-"
+                print(f"{p.key}\t{p.category}\t{','.join(p.regions)}\t{seen}\t{p.url}")
+            return 0
+        n = launcher.open([(p.key, p.url) for p in hits], skip_opened=not args.again)
+    print(f"opening {n} portals, {args.interval:g}s apart", file=sys.stderr)
+    try:
+        launcher.wait()
+    except KeyboardInterrupt:
+        launcher.pause()
+        print(f"\npaused; {launcher.remaining()} left (ludos portals --resume)", file=sys.stderr)
+        return 1
+    return 0
+
+def cmd_vault(args):
+    try:
+        if args.action == "migrate":
+            copied, missing = migrate(args.path, delete_old=args.delete_old)
+            print(f"copied {copied} secrets into {args.path}")
+            for label in missing:
+                print(f"warning: '{label}' is indexed but has no keyring entry; skipped", file=sys.stderr)
+        else:
+            for label, meta in Vault.unlock(args.path).items():
+                print(f"{label}  added={meta.get('created', '')}")
+    except VaultError as e:
+        print(f"ludos: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def _timestamp(text):
+    if text == "now":
+        return datetime.now(timezone.utc).timestamp()
+    dt = datetime.fromisoformat(text.rstrip("Z"))
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+
+def cmd_rotlog(args):
+    # Lookups open the log read-only, so they are safe while the GUI is appending to it.
+    logs = RotationLogs(readonly=args.action == "at")
+    log = logs.get(args.schedule)
+    try:
+        if args.action == "at":
+            hit = log.active_at(_timestamp(args.value))
+            if hit is None:
+                print("no password was active at that time", file=sys.stderr)
+                return 1
+            print(f"{datetime.fromtimestamp(hit[0], timezone.utc).isoformat()} {hit[1]}")
+        elif args.action == "import":
+            print(f"imported {log.import_legacy(args.value)} entries into '{args.schedule}'")
+        elif args.action == "prune":
+            log.retention_seconds = float(args.value) * 86400
+            print(f"dropped {log.apply_retention()} segments")
+        elif args.action == "guard":
+            guard = ReuseGuard(logs)
+            try:
+                if args.value == "rebuild":
+                    guard.rebuild(args.schedule)
+                elif args.value != "stats":
+                    raise ValueError("guard takes 'stats' or 'rebuild'")
+                st = guard.stats(args.schedule)
+                print(f"{st['items']} passwords in {st['stages']} stages, {st['bytes'] / 1024:.1f} KiB; "
+                      f"false-positive rate {st['fp_estimate']:.2e} (configured bound {st['fp_bound']:.0e})")
+            finally:
+                guard.close()
+    finally:
+        logs.close()
+    return 0
+
+def cmd_breach(args):
+    if args.action == "index":
+        print(f"wrote {build_index(args.db)}")
+        if args.bloom:
+            print(f"wrote {build_bloom(args.db, args.fp_rate)}")
+        return 0
+    checker = BreachChecker(args.db)
+    hits = 0
+    try:
+        if args.action == "check":
+            for line in sys.stdin:
+                n = checker.count(line.rstrip("\r\n"))
+                hits += n > 0
+                print(n)
+        else:
+            logs = RotationLogs(readonly=True)
+            try:
+                for name in [args.schedule] if args.schedule else logs.names():
+                    for ts, pw in logs.get(name).records():
+                        n = checker.count(pw)
+                        if n:
+                            hits += 1
+                            print(f"{name}\t{datetime.fromtimestamp(ts, timezone.utc).isoformat()}\t{n}")
+            finally:
+                logs.close()
+            if not args.quiet:
+                print(f"{hits} breached password(s) found", file=sys.stderr)
+    finally:
+        checker.close()
+    return 1 if hits else 0
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="ludos", description="Headless Ludos tools (no GUI dependencies).")
+    p.add_argument("--metrics", action="store_true", help="time the hot paths and print a summary to stderr at exit (also: LUDOS_METRICS=1)")
+    p.add_argument("--metrics-file", metavar="FILE", help="like --metrics, but append the numbers to FILE as one JSON line (also: LUDOS_METRICS=FILE)")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    pw = sub.add_parser("passwords", help="generate passwords in bulk, one per line")
+    pw.add_argument("-n", "--count", type=int, default=1)
+    pw.add_argument("-l", "--length", type=int, default=24)
+    pw.add_argument("-c", "--classes", default="ulds", help="any of u=A-Z l=a-z d=0-9 s=symbols (default: ulds)")
+    pw.add_argument("-o", "--output", help="write to file instead of stdout")
+    pw.set_defaults(func=cmd_passwords)
+
+    lt = sub.add_parser("letters", help="render DMCA/erasure letters in bulk from CSV or NDJSON")
+    lt.add_argument("input", help="rows with name, email and kind (erasure|dmca), plus identifiers/law or infringing_urls/original_desc")
+    lt.add_argument("output", help="output directory, or a .zip archive")
+    lt.add_argument("--format", choices=["csv", "ndjson"], help="default: from the input file extension")
+    lt.add_argument("--brokers", action="store_true", help="one erasure letter per data broker for every row")
+    lt.add_argument("-w", "--workers", type=int, default=8)
+    lt.add_argument("-q", "--quiet", action="store_true")
+    lt.set_defaults(func=cmd_letters)
+
+    ln = sub.add_parser("links", help="check the portal links (exit status 1 if any are dead)")
+    ln.add_argument("urls", nargs="*", help="URLs to check instead of the built-in portals")
+    ln.add_argument("--ttl", type=float, default=24, help="reuse cached results younger than this many hours")
+    ln.add_argument("-w", "--workers", type=int, default=16)
+    ln.add_argument("--timeout", type=float, default=10)
+    ln.set_defaults(func=cmd_links)
+
+    po = sub.add_parser("portals", help="search the portal registry, or open matches in the browser")
+    po.add_argument("query", nargs="*", help="prefix search over name, site, region and tags (default: everything)")
+    po.add_argument("-c", "--category", choices=list(CATEGORIES))
+    po.add_argument("--open", action="store_true", help="open the matches, skipping portals opened in an earlier session")
+    po.add_argument("--again", action="store_true", help="with --open, include portals opened before")
+    po.add_argument("--resume", action="store_true", help="open whatever the last session left pending")
+    po.add_argument("--reset", action="store_true", help="forget which portals were opened")
+    po.add_argument("--interval", type=float, default=1.5, help="seconds between tabs (default: %(default)s)")
+    po.add_argument("--browser", help="webbrowser name, e.g. firefox (default: the system browser)")
+    po.set_defaults(func=cmd_portals)
+
+    vt = sub.add_parser("vault", help="move TOTP secrets into a single encrypted vault file")
+    vt.add_argument("action", choices=["migrate", "list"])
+    vt.add_argument("--path", default=VAULT_PATH)
+    vt.add_argument("--delete-old", action="store_true", help="after migrating, delete the per-label keyring entries")
+    vt.set_defaults(func=cmd_vault)
+
+    rl = sub.add_parser("rotlog", help="query or maintain rotation logs")
+    rl.add_argument("action", choices=["at", "import", "prune", "guard"])
+    rl.add_argument("value", help="at: ISO time (UTC) or 'now'; import: legacy .txt log; prune: retention in days; guard: 'stats' or 'rebuild' for the reuse filter")
+    rl.add_argument("-s", "--schedule", default="default")
+    rl.set_defaults(func=cmd_rotlog)
+
+    br = sub.add_parser("breach", help="check passwords against an offline HIBP SHA-1 dump (exit status 1 on any hit)")
+    br.add_argument("action", choices=["check", "audit", "index"], help="check: passwords on stdin, one per line; audit: every rotation log entry; index: build the .idx (and --bloom) sidecars")
+    br.add_argument("--db", default=BREACH_PATH, help="sorted HASH:COUNT dump (default: $LUDOS_BREACH_DB or %(default)s)")
+    br.add_argument("-s", "--schedule", help="audit: only this schedule")
+    br.add_argument("--bloom", action="store_true", help="index: also build a Bloom filter for fast misses")
+    br.add_argument("--fp-rate", type=float, default=0.001)
+    br.add_argument("-q", "--quiet", action="store_true")
+    br.set_defaults(func=cmd_breach)
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics or args.metrics_file:
+        enable_metrics(args.metrics_file)
+    try:
+        with span(f"cli.{args.command}"):
+            return args.func(args)
+    except (ValueError, OSError) as e:
+        print(f"ludos: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,145 +1,102 @@
-import os, json, secrets, string, time, webbrowser, textwrap, threading
-from datetime import datetime, timedelta
-import customtkinter as ctk
+import argparse, os, queue, sys, threading, time, webbrowser
+from datetime import datetime
 
-try:
-    import pyotp
-except:
-    pyotp = None
-try:
-    import keyring
-except:
-    keyring = None
-
-APP = "ludos-gui"
-HOME = os.path.expanduser("~")
-INDEX_PATH = os.path.join(HOME, ".ludos_totp_index.json")
-ROTATION_FILE = os.path.join(HOME, ".ludos_rotation.txt")
-
-DATA_BROKERS = {
-    "whitepages": "https://www.whitepages.com/suppression_requests",
-    "spokeo": "https://www.spokeo.com/optout",
-    "beenverified": "https://www.beenverified.com/app/optout/search",
-    "intelius": "https://www.intelius.com/opt-out/submit",
-    "mylife": "https://www.mylife.com/ccpa",
-    "radaris": "https://radaris.com/control/privacy",
-    "truthfinder": "https://www.truthfinder.com/opt-out/",
-    "fastpeople": "https://www.fastpeoplesearch.com/removal",
-    "peoplefinder": "https://www.peoplefinder.com/optout",
-    "peekyou": "https://www.peekyou.com/about/contact/optout/index.php",
-    "usphonebook": "https://www.usphonebook.com/opt-out",
-    "clustrmaps": "https://clustrmaps.com/bl/opt-out",
-    "neighborwho": "https://www.neighborwho.com/optout/",
-    "searchpeoplefree": "https://www.searchpeoplefree.com/opt-out",
-    "zabasearch": "https://www.zabasearch.com/optOut.php"
-}
-
-REMOVAL_PORTALS = {
-    "google_outdated": "https://search.google.com/search-console/remove-outdated-content",
-    "google_personal": "https://support.google.com/websearch/troubleshooter/3111061",
-    "bing_removal": "https://www.bing.com/webmaster/tools/content-removal"
-}
-
-ACCOUNT_PAGES = {
-    "youtube_delete": "https://myaccount.google.com/deleteservices",
-    "discord_delete": "https://support.discord.com/hc/en-us/articles/212500837-Deleting-Your-Account",
-    "github_delete": "https://github.com/settings/admin",
-    "vercel_delete": "https://vercel.com/docs/accounts/account-deletion",
-    "twitter_delete": "https://help.x.com/en/managing-your-account/how-to-deactivate-twitter-account",
-    "instagram_delete": "https://www.instagram.com/accounts/login/?next=/accounts/remove/request/permanent/",
-    "facebook_delete": "https://www.facebook.com/help/delete_account"
-}
-
-def load_index():
-    if not os.path.exists(INDEX_PATH):
-        return {}
-    try:
-        with open(INDEX_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {}
-
-def save_index(idx):
-    with open(INDEX_PATH, "w", encoding="utf-8") as f:
-        json.dump(idx, f, indent=2)
-
-def strong_password(length=24, use_upper=True, use_lower=True, use_digits=True, use_symbols=True):
-    pools = []
-    if use_upper: pools.append(string.ascii_uppercase)
-    if use_lower: pools.append(string.ascii_lowercase)
-    if use_digits: pools.append(string.digits)
-    if use_symbols: pools.append("!@#$%^&*()-_=+[]{};:,<.>/?")
-    pool = "".join(pools) if pools else string.ascii_letters + string.digits
-    while True:
-        chars = []
-        for s in pools: chars.append(secrets.choice(s))
-        chars += [secrets.choice(pool) for _ in range(max(0, length - len(chars)))]
-        secrets.SystemRandom().shuffle(chars)
-        pw = "".join(chars[:length])
-        if not pools or all(any(c in pw for c in s) for s in pools): return pw
-
-def dmca_letter(name, email, infringing_urls, original_desc, signature_name):
-    body = f"""
-To Whom It May Concern,
-
-I am the copyright owner of the material identified below. I request removal or disabling of access to infringing content under 17 U.S.C. § 512(c).
-
-Original work: {original_desc}
-Infringing URLs:
-{os.linesep.join(infringing_urls)}
-
-My contact information:
-Name: {name}
-Email: {email}
-
-I have a good-faith belief that the use of the material is not authorized by the copyright owner, its agent, or the law.
-The information in this notice is accurate, and under penalty of perjury, I am authorized to act on behalf of the owner.
-
-Signature: {signature_name}
-Date: {datetime.utcnow().date().isoformat()}
-"""
-    return textwrap.dedent(body).strip()
-
-def privacy_erasure_letter(name, email, identifiers, law):
-    body = f"""
-Hello,
-
-I am exercising my right to deletion under {law}. Please delete all personal data related to me across your systems, including backups when feasible, and confirm completion.
-
-Identifiers:
-{os.linesep.join(identifiers)}
-
-Contact:
-Name: {name}
-Email: {email}
-
-Please confirm receipt and completion within the statutory period and describe any data you are legally required to retain.
-"""
-    return textwrap.dedent(body).strip()
-
-class RotationWorker:
-    def __init__(self):
-        self.thread = None
-        self.stop_event = threading.Event()
-    def start(self, hours, length, opts):
-        if self.thread and self.thread.is_alive(): return
-        self.stop_event.clear()
-        self.thread = threading.Thread(target=self.run, args=(hours, length, opts), daemon=True)
-        self.thread.start()
-    def run(self, hours, length, opts):
-        interval = max(0.1, float(hours)) * 3600
-        while not self.stop_event.is_set():
-            pw = strong_password(length, *opts)
-            with open(ROTATION_FILE, "a", encoding="utf-8") as f:
-                f.write(f"{datetime.utcnow().isoformat()}Z {pw}\n")
-            for _ in range(int(interval)):
-                if self.stop_event.is_set(): break
-                time.sleep(1)
-    def stop(self):
-        self.stop_event.set()
+_T0 = time.perf_counter()
+import customtkinter as ctk
+_T1 = time.perf_counter()
+
+from ludos_breach import default_checker
+from ludos_launcher import Launcher
+from ludos_letters import dmca_letter, privacy_erasure_letter, unique_path
+from ludos_links import LinkChecker, badge
+from ludos_metrics import enable as enable_metrics
+from ludos_passwords import strong_password
+from ludos_portals import CATEGORIES, default_registry
+from ludos_rotation import RotationScheduler
+from ludos_rotlog import LOG_DIR
+from ludos_tasks import StallMonitor, TaskRunner
+from ludos_otp import from_stored, parse_uri
+from ludos_totp import CodeBoard, SecretCache, load_keyring
+from ludos_vault import LazyStore
+
+STARTUP = [("import customtkinter", _T1 - _T0), ("import ludos modules", time.perf_counter() - _T1)]
+BREACH_TRIES = 100   # draws before Generate gives up on finding an unbreached password
+
+class PortalList(ctk.CTkFrame):
+    # Virtualized list: a fixed pool of row widgets over `items` (Portal tuples). Scrolling
+    # only reconfigures the rows on screen, so building and refreshing cost the same for
+    # 25 entries or 10k. Ticked keys live in `selected` and survive filtering.
+    def __init__(self, master, rows=12, mark=lambda p: "", on_open=lambda p: webbrowser.open(p.url), on_select=None, **kw):
+        super().__init__(master, **kw)
+        self.items = []
+        self.top = 0
+        self.selected = set()
+        self.mark = mark
+        self.on_open = on_open
+        self.on_select = on_select
+        self.grid_columnconfigure(1, weight=1)
+        self.rows = []
+        self.checks = []
+        for r in range(rows):
+            chk = ctk.CTkCheckBox(self, text="", width=24, command=lambda r=r: self.toggle(r))
+            chk.grid(row=r, column=0, padx=(10,0), pady=3)
+            btn = ctk.CTkButton(self, text="", anchor="w", corner_radius=10)
+            btn.grid(row=r, column=1, padx=(4,4), pady=3, sticky="we")
+            self.checks.append(chk)
+            self.rows.append(btn)
+        self.bar = ctk.CTkScrollbar(self, command=self.yview)
+        self.bar.grid(row=0, column=2, rowspan=rows, padx=(0,6), pady=6, sticky="ns")
+        for w in (self, *self.rows, *self.checks):
+            w.bind("<MouseWheel>", self.wheel)
+            w.bind("<Button-4>", self.wheel)
+            w.bind("<Button-5>", self.wheel)
+
+    def set_items(self, items):
+        self.items = items
+        self.top = 0
+        self.render()
+
+    def yview(self, *args):
+        # CTkScrollbar sends ("moveto", fraction); also accept Tk's ("scroll", n, "units"|"pages").
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            self.top += int(float(args[1])) * (len(self.rows) if args[2] == "pages" else 1)
+        self.render()
+
+    def toggle(self, row):
+        key = self.items[self.top + row].key
+        if self.checks[row].get(): self.selected.add(key)
+        else: self.selected.discard(key)
+        if self.on_select: self.on_select(self.selected)
+
+    def wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.top += -3 if up else 3
+        self.render()
+
+    def render(self):
+        n = len(self.rows)
+        self.top = max(0, min(self.top, len(self.items) - n))
+        for i, (chk, btn) in enumerate(zip(self.checks, self.rows)):
+            if self.top + i < len(self.items):
+                p = self.items[self.top + i]
+                where = ", ".join(p.regions)
+                btn.configure(text=f"{p.name}  {self.mark(p)}    {CATEGORIES.get(p.category, p.category)}{' · ' + where if where else ''}",
+                              command=lambda p=p: self.on_open(p))
+                chk.select() if p.key in self.selected else chk.deselect()
+                chk.grid(); btn.grid()
+            else:
+                chk.grid_remove(); btn.grid_remove()
+        total = max(1, len(self.items))
+        self.bar.set(self.top / total, min(1.0, (self.top + n) / total))
 
 class App(ctk.CTk):
-    def __init__(self):
+    def __init__(self, profile=False, loop_monitor=False):
+        t = time.perf_counter()
+        self.profile = profile
+        self.painted = False
+        self.timings = list(STARTUP)
         super().__init__()
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("dark-blue")
@@ -152,7 +109,7 @@ class App(ctk.CTk):
         header = ctk.CTkLabel(self, text="Ludos — Legal Privacy Toolkit (Passwords • TOTP • Letters • Portals)", font=("Inter", 18, "bold"))
         header.grid(row=0, column=0, padx=16, pady=(16,8), sticky="w")
 
-        self.tabs = ctk.CTkTabview(self, width=960, height=560, segmented_button_fg_color=None, segmented_button_selected_color=None)
+        self.tabs = ctk.CTkTabview(self, width=960, height=560, segmented_button_fg_color=None, segmented_button_selected_color=None, command=self.on_tab)
         self.tabs.grid(row=1, column=0, padx=16, pady=8, sticky="nsew")
 
         self.tab_pw = self.tabs.add("Passwords")
@@ -160,16 +117,60 @@ class App(ctk.CTk):
         self.tab_letters = self.tabs.add("Takedown Letters")
         self.tab_portals = self.tabs.add("Removal Portals")
 
-        self.rotation = RotationWorker()
+        # Tabs are built the first time they are selected.
+        self.builders = {"Passwords": self.build_passwords, "TOTP": self.build_totp, "Takedown Letters": self.build_letters, "Removal Portals": self.build_portals}
+        self.built = set()
+
+        self.tasks = TaskRunner(self, on_busy=lambda busy: self.configure(cursor="watch" if busy else ""))
+        self.monitor = None
+        if loop_monitor:
+            self.monitor = StallMonitor(self, on_stall=lambda ms: print(f"main loop stalled {ms:.1f} ms", file=sys.stderr))
+            self.monitor.start()
 
-        self.build_passwords()
-        self.build_totp()
-        self.build_letters()
-        self.build_portals()
+        self.rotation = RotationScheduler()
+        self.rotation.start()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         legal = "This tool does not bypass security, alter provider logs, or delete third-party content you do not control. It provides strong passwords, TOTP codes for your own exported secrets, standard takedown letters, and quick links to official removal/account-closure pages. You are responsible for complying with laws and ToS."
         footer = ctk.CTkLabel(self, text=legal, wraplength=920, font=("Inter", 12))
         footer.grid(row=2, column=0, padx=16, pady=(8,16), sticky="we")
+        self.mark("build window", t)
+
+        self.on_tab()
+        if profile:
+            self.bind("<Map>", self.first_paint, add="+")
+
+    def on_close(self):
+        # Queued keyring/file work is dropped rather than run after the window is gone; the
+        # launcher keeps what it had not opened yet for Resume next time.
+        self.tasks.shutdown()
+        self.rotation.stop()
+        if self.monitor: self.monitor.stop()
+        if "Removal Portals" in self.built: self.launcher.pause()
+        self.destroy()
+
+    def on_tab(self):
+        name = self.tabs.get()
+        if name in self.built: return
+        self.built.add(name)
+        t = time.perf_counter()
+        self.builders[name]()
+        self.mark(f"build tab {name}", t)
+
+    def mark(self, phase, since):
+        # Startup phases are reported together at first paint, later ones (lazy tab builds)
+        # as they happen.
+        self.timings.append((phase, time.perf_counter() - since))
+        if self.profile and self.painted:
+            print(f"{phase:<28} {self.timings[-1][1] * 1000:8.1f} ms", file=sys.stderr)
+
+    def first_paint(self, _event=None):
+        if self.painted: return
+        self.update_idletasks()
+        self.mark("first paint (since import)", _T0)
+        self.painted = True
+        for phase, dt in self.timings:
+            print(f"{phase:<28} {dt * 1000:8.1f} ms", file=sys.stderr)
 
     def build_passwords(self):
         frame = self.tab_pw
@@ -201,10 +202,12 @@ class App(ctk.CTk):
         copy_btn = ctk.CTkButton(btns, text="Copy", command=self.copy_password, corner_radius=12)
         gen_btn.grid(row=0, column=0, padx=6, pady=8)
         copy_btn.grid(row=0, column=1, padx=6, pady=8)
+        self.pw_status = ctk.CTkLabel(btns, text="")
+        self.pw_status.grid(row=0, column=2, padx=8, pady=8, sticky="w")
 
         rot = ctk.CTkFrame(frame, corner_radius=12)
         rot.grid(row=3, column=0, padx=16, pady=8, sticky="we")
-        ctk.CTkLabel(rot, text=f"Rotation log file: {ROTATION_FILE}").grid(row=0, column=0, columnspan=4, padx=8, pady=6, sticky="w")
+        ctk.CTkLabel(rot, text=f"Rotation logs: {os.path.join(LOG_DIR, '<schedule>')}").grid(row=0, column=0, columnspan=4, padx=8, pady=6, sticky="w")
         ctk.CTkLabel(rot, text="Every (hours)").grid(row=1, column=0, padx=8, pady=6)
         self.rot_hours = ctk.CTkEntry(rot, width=100)
         self.rot_hours.insert(0, "2")
@@ -213,6 +216,10 @@ class App(ctk.CTk):
         self.rot_len = ctk.CTkEntry(rot, width=80)
         self.rot_len.insert(0, "24")
         self.rot_len.grid(row=1, column=3, padx=8, pady=6)
+        ctk.CTkLabel(rot, text="Schedule").grid(row=1, column=4, padx=8, pady=6)
+        self.rot_name = ctk.CTkEntry(rot, width=140)
+        self.rot_name.insert(0, "default")
+        self.rot_name.grid(row=1, column=5, padx=8, pady=6)
         self.rot_upper = ctk.CTkCheckBox(rot, text="A-Z"); self.rot_upper.select()
         self.rot_lower = ctk.CTkCheckBox(rot, text="a-z"); self.rot_lower.select()
         self.rot_digits = ctk.CTkCheckBox(rot, text="0-9"); self.rot_digits.select()
@@ -225,12 +232,31 @@ class App(ctk.CTk):
         stop_btn = ctk.CTkButton(rot, text="Stop Rotation", command=self.stop_rotation, corner_radius=12)
         start_btn.grid(row=3, column=0, padx=8, pady=8)
         stop_btn.grid(row=3, column=1, padx=8, pady=8)
+        self.rot_list = ctk.CTkLabel(rot, text="", justify="left")
+        self.rot_list.grid(row=4, column=0, columnspan=6, padx=8, pady=(0,8), sticky="w")
+        self.show_rotations()
 
     def generate_password(self):
+        # Draws until a password is not in the breach dump (when one is installed). Mapping
+        # the dump and the lookups run on a worker; a broken dump, or 100 breached draws in a
+        # row, is reported instead of handing out a password.
         length = int(self.pw_length.get())
-        pw = strong_password(length, self.use_upper.get()==1, self.use_lower.get()==1, self.use_digits.get()==1, self.use_symbols.get()==1)
-        self.pw_output.delete(0, "end")
-        self.pw_output.insert(0, pw)
+        opts = (self.use_upper.get()==1, self.use_lower.get()==1, self.use_digits.get()==1, self.use_symbols.get()==1)
+        def work():
+            checker = default_checker()
+            for _ in range(BREACH_TRIES):
+                pw = strong_password(length, *opts)
+                if checker is None or not checker.count(pw):
+                    return pw
+            raise ValueError(f"all {BREACH_TRIES} generated passwords are in the breach dump; check the dump file")
+        def done(pw):
+            self.pw_output.delete(0, "end")
+            self.pw_output.insert(0, pw)
+            self.pw_status.configure(text="")
+        def failed(e):
+            self.pw_output.delete(0, "end")
+            self.pw_status.configure(text=f"Breach check failed: {e}")
+        self.tasks.submit("password", work, on_done=done, on_error=failed)
 
     def copy_password(self):
         pw = self.pw_output.get().strip()
@@ -243,14 +269,28 @@ class App(ctk.CTk):
             hours = float(self.rot_hours.get().strip())
             length = int(self.rot_len.get().strip())
             opts = (self.rot_upper.get()==1, self.rot_lower.get()==1, self.rot_digits.get()==1, self.rot_symbols.get()==1)
-            self.rotation.start(hours, length, opts)
+            self.rotation.add(self.rot_name.get().strip() or "default", hours, length, opts)
         except:
             pass
+        self.show_rotations()
 
     def stop_rotation(self):
-        self.rotation.stop()
+        self.rotation.remove(self.rot_name.get().strip() or "default")
+        self.show_rotations()
+
+    def show_rotations(self):
+        lines = [f"{s['name']}: every {s['interval']/3600:g}h, length {s['length']}, next {datetime.fromtimestamp(s['next']).strftime('%Y-%m-%d %H:%M')}"
+                 + (f" (last rotation failed: {s['error']})" if s.get("error") else "") for s in self.rotation.list()]
+        self.rot_list.configure(text="\n".join(lines) or "No rotation schedules.")
 
     def build_totp(self):
+        t = time.perf_counter()
+        self.tasks.submit("backends", load_keyring, on_done=lambda _: self.mark("import keyring", t))
+        self.store = LazyStore()
+        self.secrets = SecretCache(self.store)
+        self.board = CodeBoard(self.secrets)
+        self.dash_jobs = {}
+
         frame = self.tab_totp
         frame.grid_columnconfigure(1, weight=1)
 
@@ -260,7 +300,7 @@ class App(ctk.CTk):
         ctk.CTkLabel(frame, text="Label").grid(row=1, column=0, padx=16, pady=8, sticky="e")
         self.t_label = ctk.CTkEntry(frame, width=220)
         self.t_label.grid(row=1, column=1, padx=8, pady=8, sticky="we")
-        ctk.CTkLabel(frame, text="Base32 Secret").grid(row=2, column=0, padx=16, pady=8, sticky="e")
+        ctk.CTkLabel(frame, text="Base32 Secret or otpauth:// URI").grid(row=2, column=0, padx=16, pady=8, sticky="e")
         self.t_secret = ctk.CTkEntry(frame, width=360, show="•")
         self.t_secret.grid(row=2, column=1, padx=8, pady=8, sticky="we")
 
@@ -280,63 +320,150 @@ class App(ctk.CTk):
         code_btn.grid(row=5, column=1, padx=8, pady=8, sticky="e")
         rem_btn.grid(row=5, column=2, padx=16, pady=8, sticky="e")
 
-    def totp_add(self):
-        if pyotp is None or keyring is None:
-            self.t_codes.delete("1.0","end"); self.t_codes.insert("end","Install: pip install pyotp keyring")
+        dash = ctk.CTkFrame(frame, corner_radius=12)
+        dash.grid(row=6, column=0, columnspan=3, padx=16, pady=(0,16), sticky="we")
+        dash.grid_columnconfigure(4, weight=1)
+        ctk.CTkButton(dash, text="Live Dashboard", command=self.dash_start, corner_radius=12).grid(row=0, column=0, padx=8, pady=8)
+        ctk.CTkButton(dash, text="Lock", command=self.dash_lock, corner_radius=12).grid(row=0, column=1, padx=8, pady=8)
+        ctk.CTkLabel(dash, text="Lock after idle (min)").grid(row=0, column=2, padx=8, pady=8)
+        self.dash_timeout = ctk.CTkEntry(dash, width=60)
+        self.dash_timeout.insert(0, "5")
+        self.dash_timeout.grid(row=0, column=3, padx=8, pady=8)
+        self.dash_status = ctk.CTkLabel(dash, text="")
+        self.dash_status.grid(row=0, column=4, padx=8, pady=8, sticky="e")
+
+    def dash_cancel(self):
+        for job in self.dash_jobs.values():
+            self.after_cancel(job)
+        self.dash_jobs.clear()
+        self.tasks.cancel("dash")
+
+    def t_say(self, text):
+        self.t_codes.delete("1.0","end"); self.t_codes.insert("end", text)
+
+    def dash_start(self):
+        try:
+            self.secrets.timeout = max(0.0, float(self.dash_timeout.get().strip())) * 60
+        except ValueError:
+            pass
+        self.secrets.touch()
+        self.dash_cancel()
+        self.dash_rollover()
+
+    def dash_lock(self):
+        self.dash_cancel()
+        self.secrets.clear()
+        self.board.invalidate()
+        self.dash_status.configure(text="Locked")
+        self.t_say("Dashboard locked. Secrets dropped from memory.")
+
+    def dash_rollover(self):
+        # Runs just after the next window boundary of any label (labels can have different
+        # periods). The keyring prefetch and HMACs run on a worker; the display keeps ticking
+        # meanwhile.
+        self.dash_jobs.pop("rollover", None)
+        if self.secrets.idle():
+            self.dash_lock()
+            return
+        def work():
+            if load_keyring() is None: return False
+            self.board.refresh(self.store.labels())
+            return True
+        self.tasks.submit("dash", work, on_done=self.dash_refreshed, on_error=lambda e: self.t_say(f"Keyring error: {e}"))
+
+    def dash_refreshed(self, ok):
+        if not ok:
+            self.t_say("Install: pip install keyring")
             return
+        self.dash_status.configure(text=f"keyring round trips: {self.board.last_round_trips} this window, {self.secrets.round_trips} total")
+        self.dash_tick()
+        self.dash_jobs["rollover"] = self.after(int(self.board.remaining() * 1000) + 5, self.dash_rollover)
+
+    def dash_tick(self):
+        # Countdown only: redraws cached codes, no keyring or HMAC work.
+        job = self.dash_jobs.pop("tick", None)
+        if job: self.after_cancel(job)
+        self.t_codes.delete("1.0","end")
+        if not self.board.labels:
+            self.t_codes.insert("end","No TOTP labels stored.")
+        for label in self.board.labels:
+            code = self.board.current.get(label)
+            if code is None:
+                self.t_codes.insert("end",f"{label:<24} (no secret)\n")
+            else:
+                left = int(self.board.remaining(label)) + 1
+                self.t_codes.insert("end",f"{label:<24} {code}   next {self.board.next.get(label, '')}   {left:>2}s\n")
+        self.dash_jobs["tick"] = self.after(int((self.board.remaining() % 1) * 1000) + 5, self.dash_tick)
+
+    # Keyring and index calls below run through self.tasks under one "totp" key, so a newer
+    # request supersedes an older one that is still waiting on the keyring.
+    def totp_add(self):
         label = self.t_label.get().strip()
         secret = self.t_secret.get().strip().replace(" ", "")
+        if secret.startswith("otpauth://") and not label:
+            try:
+                otp = parse_uri(secret)
+                label = f"{otp.issuer}:{otp.label}" if otp.issuer else otp.label
+            except ValueError:
+                pass
         if not label or not secret:
             return
-        try:
-            _ = pyotp.TOTP(secret).now()
-        except:
-            self.t_codes.delete("1.0","end"); self.t_codes.insert("end","Invalid TOTP secret.")
-            return
-        svc = f"{APP}:{label}"
-        keyring.set_password(APP, svc, secret)
-        idx = load_index(); idx[label] = {"created": datetime.utcnow().isoformat()+"Z"}; save_index(idx)
-        self.t_codes.delete("1.0","end"); self.t_codes.insert("end",f"Stored secret for '{label}'.")
+        self.dash_cancel(); self.secrets.touch()
+        def work():
+            if load_keyring() is None:
+                return "Install: pip install keyring"
+            try:
+                _ = from_stored(secret).now()
+            except ValueError:
+                return "Invalid TOTP secret or otpauth:// URI."
+            self.store.put(label, secret)
+            self.secrets.put(label, secret)
+            return f"Stored secret for '{label}'."
+        self.t_say("Storing…")
+        self.tasks.submit("totp", work, on_done=lambda msg: (self.board.invalidate(), self.t_say(msg)), on_error=lambda e: self.t_say(f"Keyring error: {e}"))
 
     def totp_code(self):
-        if pyotp is None or keyring is None:
-            self.t_codes.delete("1.0","end"); self.t_codes.insert("end","Install: pip install pyotp keyring")
-            return
         label = self.t_code_label.get().strip()
         if not label: return
-        svc = f"{APP}:{label}"
-        secret = keyring.get_password(APP, svc)
-        if not secret:
-            self.t_codes.delete("1.0","end"); self.t_codes.insert("end","No secret stored for that label.")
-            return
-        code = pyotp.TOTP(secret).now()
-        self.clipboard_clear(); self.clipboard_append(code)
-        self.t_codes.delete("1.0","end"); self.t_codes.insert("end",f"{label}: {code} (copied)")
+        self.dash_cancel(); self.secrets.touch()
+        def work():
+            if load_keyring() is None:
+                return None, "Install: pip install keyring"
+            totp = self.secrets.get(label)
+            if not totp:
+                return None, "No secret stored for that label."
+            return totp.now(), None
+        def done(result):
+            code, msg = result
+            if code is None:
+                self.t_say(msg)
+                return
+            self.clipboard_clear(); self.clipboard_append(code)
+            self.t_say(f"{label}: {code} (copied)")
+        self.tasks.submit("totp", work, on_done=done, on_error=lambda e: self.t_say(f"Keyring error: {e}"))
 
     def totp_list(self):
-        idx = load_index()
-        self.t_codes.delete("1.0","end")
-        if not idx:
-            self.t_codes.insert("end","No TOTP labels stored.")
-            return
-        for k, v in idx.items():
-            self.t_codes.insert("end",f"{k}  added={v.get('created','')}\n")
+        self.dash_cancel()
+        def done(items):
+            self.t_codes.delete("1.0","end")
+            if not items:
+                self.t_codes.insert("end","No TOTP labels stored.")
+                return
+            for k, v in items:
+                self.t_codes.insert("end",f"{k}  added={v.get('created','')}\n")
+        self.tasks.submit("totp", lambda: self.store.items(), on_done=done, on_error=lambda e: self.t_say(f"Keyring error: {e}"))
 
     def totp_remove(self):
-        if keyring is None:
-            self.t_codes.delete("1.0","end"); self.t_codes.insert("end","Install: pip install keyring")
-            return
         label = self.t_code_label.get().strip()
         if not label: return
-        svc = f"{APP}:{label}"
-        try:
-            keyring.delete_password(APP, svc)
-        except:
-            pass
-        idx = load_index()
-        if label in idx:
-            del idx[label]; save_index(idx)
-        self.t_codes.delete("1.0","end"); self.t_codes.insert("end",f"Removed '{label}'")
+        self.dash_cancel()
+        def work():
+            if load_keyring() is None:
+                return "Install: pip install keyring"
+            self.store.remove(label)
+            self.secrets.forget(label)
+            return f"Removed '{label}'"
+        self.tasks.submit("totp", work, on_done=lambda msg: (self.board.invalidate(), self.t_say(msg)), on_error=lambda e: self.t_say(f"Keyring error: {e}"))
 
     def build_letters(self):
         frame = self.tab_letters
@@ -376,11 +503,18 @@ class App(ctk.CTk):
         frame.grid_rowconfigure(1, weight=1)
 
     def write_txt(self, prefix, content):
-        fn = f"{prefix}_{int(time.time())}.txt"
-        with open(fn, "w", encoding="utf-8") as f:
-            f.write(content)
-        self.lt_out.delete("1.0","end")
-        self.lt_out.insert("end", f"Wrote {fn}\n\n{content}")
+        def work():
+            fn = unique_path(".", prefix)
+            with open(fn, "w", encoding="utf-8") as f:
+                f.write(content)
+            return fn
+        def done(fn):
+            self.lt_out.delete("1.0","end")
+            self.lt_out.insert("end", f"Wrote {fn}\n\n{content}")
+        def failed(e):
+            self.lt_out.delete("1.0","end")
+            self.lt_out.insert("end", f"Could not write letter: {e}")
+        self.tasks.submit("letters", work, on_done=done, on_error=failed)
 
     def make_dmca(self):
         name = self.lt_name.get().strip()
@@ -408,24 +542,178 @@ class App(ctk.CTk):
     def build_portals(self):
         frame = self.tab_portals
         frame.grid_columnconfigure(0, weight=1)
-        cols = ctk.CTkFrame(frame, corner_radius=12)
-        cols.grid(row=0, column=0, padx=16, pady=16, sticky="nsew")
-        for i in range(3): cols.grid_columnconfigure(i, weight=1)
-        frame.grid_rowconfigure(0, weight=1)
-
-        a = ctk.CTkFrame(cols, corner_radius=12); a.grid(row=0, column=0, padx=8, pady=8, sticky="nsew")
-        b = ctk.CTkFrame(cols, corner_radius=12); b.grid(row=0, column=1, padx=8, pady=8, sticky="nsew")
-        c = ctk.CTkFrame(cols, corner_radius=12); c.grid(row=0, column=2, padx=8, pady=8, sticky="nsew")
-        for box, title in [(a,"Account Deletion"),(b,"Data Brokers"),(c,"Search/Removal")]:
-            ctk.CTkLabel(box, text=title, font=("Inter", 14, "bold")).pack(anchor="w", padx=10, pady=(10,6))
-
-        acct_list = ACCOUNT_PAGES
-        for key, url in acct_list.items():
-            ctk.CTkButton(a, text=key, corner_radius=12, command=lambda u=url: webbrowser.open(u)).pack(fill="x", padx=10, pady=4)
-        for key, url in DATA_BROKERS.items():
-            ctk.CTkButton(b, text=key, corner_radius=12, command=lambda u=url: webbrowser.open(u)).pack(fill="x", padx=10, pady=4)
-        for key, url in REMOVAL_PORTALS.items():
-            ctk.CTkButton(c, text=key, corner_radius=12, command=lambda u=url: webbrowser.open(u)).pack(fill="x", padx=10, pady=4)
+        frame.grid_rowconfigure(1, weight=1)
+        self.registry = default_registry()
+        self.links = LinkChecker()
+
+        top = ctk.CTkFrame(frame, corner_radius=12)
+        top.grid(row=0, column=0, padx=16, pady=(16,8), sticky="we")
+        top.grid_columnconfigure(0, weight=1)
+        self.portal_query = ctk.CTkEntry(top, placeholder_text="Search by name, site, region or tag")
+        self.portal_query.grid(row=0, column=0, padx=8, pady=8, sticky="we")
+        self.portal_query.bind("<KeyRelease>", lambda e: self.filter_portals())
+        self.portal_cat = ctk.CTkSegmentedButton(top, values=["All", *CATEGORIES.values()], command=lambda v: self.filter_portals())
+        self.portal_cat.set("All")
+        self.portal_cat.grid(row=0, column=1, padx=8, pady=8)
+        self.portal_count = ctk.CTkLabel(top, text="")
+        self.portal_count.grid(row=0, column=2, padx=8, pady=8)
+
+        self.launch_events = queue.Queue()
+        self.launch_polling = self.launch_paused = False
+        self.launch_failed = 0
+        self.launcher = Launcher(progress=lambda key, ok: self.launch_events.put((key, ok)))
+        self.portal_list = PortalList(frame, mark=self.portal_mark, on_open=lambda p: self.open_portals([p]),
+                                      on_select=lambda keys: self.open_sel_btn.configure(text=f"Open Selected ({len(keys)})"), corner_radius=12)
+        self.portal_list.grid(row=1, column=0, padx=16, pady=8, sticky="nsew")
+
+        opener = ctk.CTkFrame(frame, corner_radius=12)
+        opener.grid(row=2, column=0, padx=16, pady=(0,8), sticky="we")
+        self.open_sel_btn = ctk.CTkButton(opener, text="Open Selected (0)", command=self.open_selected, corner_radius=12)
+        self.open_sel_btn.grid(row=0, column=0, padx=8, pady=8)
+        ctk.CTkButton(opener, text="Open All in Category", command=self.open_category, corner_radius=12).grid(row=0, column=1, padx=8, pady=8)
+        self.resume_btn = ctk.CTkButton(opener, text="Resume", command=self.resume_portals, corner_radius=12)
+        self.resume_btn.grid(row=0, column=2, padx=8, pady=8)
+        ctk.CTkButton(opener, text="Stop", command=self.stop_portals, corner_radius=12, width=70).grid(row=0, column=3, padx=8, pady=8)
+        ctk.CTkButton(opener, text="Clear History", command=self.clear_opened, corner_radius=12, width=110).grid(row=0, column=4, padx=8, pady=8)
+        self.open_interval = ctk.CTkEntry(opener, width=50)
+        self.open_interval.insert(0, "1.5")
+        self.open_interval.grid(row=0, column=5, padx=(8,2), pady=8)
+        ctk.CTkLabel(opener, text="s between tabs").grid(row=0, column=6, padx=(0,8), pady=8)
+        self.launch_status = ctk.CTkLabel(opener, text="")
+        self.launch_status.grid(row=1, column=0, columnspan=7, padx=8, pady=(0,8), sticky="w")
+        left = self.launcher.remaining()
+        self.resume_btn.configure(text=f"Resume ({left})" if left else "Resume", state="normal" if left else "disabled")
+
+        bar = ctk.CTkFrame(frame, corner_radius=12)
+        bar.grid(row=3, column=0, padx=16, pady=(0,16), sticky="we")
+        self.link_btn = ctk.CTkButton(bar, text="Check Links", command=self.check_links, corner_radius=12)
+        self.link_btn.grid(row=0, column=0, padx=8, pady=8)
+        self.link_status = ctk.CTkLabel(bar, text="✓ reachable   ⚠ refuses automated checks   ✗ broken")
+        self.link_status.grid(row=0, column=1, padx=8, pady=8, sticky="w")
+        self.filter_portals()
+        self.tasks.submit("portal-index", self.registry.prepare)
+
+    def filter_portals(self):
+        label = self.portal_cat.get()
+        category = next((k for k, v in CATEGORIES.items() if v == label), None)
+        hits = self.registry.search(self.portal_query.get(), category)
+        self.portal_list.set_items(hits)
+        self.portal_count.configure(text=f"{len(hits)} of {len(self.registry)}")
+
+    def portal_mark(self, p):
+        mark = {"ok": "✓", "blocked": "⚠", "dead": "✗", "unknown": ""}[badge(self.links.cached(p.url))]
+        return mark + ("  ↗" if self.launcher.opened_at(p.key) else "")
+
+    def open_portals(self, portals, skip_opened=False):
+        # Tabs are opened by the launcher's worker, rate-limited; progress comes back through
+        # launch_events, drained here with after() while anything is queued.
+        try:
+            self.launcher.interval = max(0.0, float(self.open_interval.get()))
+        except ValueError:
+            pass
+        n = self.launcher.open([(p.key, p.url) for p in portals], skip_opened)
+        if n: self.watch_launches()
+        else: self.launch_status.configure(text="Nothing new to open (↗ marks portals already opened; Clear History to start over)")
+
+    def open_selected(self):
+        self.open_portals([p for p in map(self.registry.get, sorted(self.portal_list.selected)) if p])
+
+    def open_category(self):
+        label = self.portal_cat.get()
+        category = next((k for k, v in CATEGORIES.items() if v == label), None)
+        if category is None:
+            self.launch_status.configure(text="Pick a category first")
+            return
+        self.open_portals(self.registry.search("", category), skip_opened=True)
+
+    def resume_portals(self):
+        if self.launcher.resume(): self.watch_launches()
+
+    def stop_portals(self):
+        self.launcher.pause()
+        self.launch_paused = True
+        if not self.launch_polling: self.drain_launches()
+
+    def clear_opened(self):
+        self.launcher.reset()
+        self.launch_paused = True
+        if not self.launch_polling: self.drain_launches()
+        self.launch_status.configure(text="History cleared")
+        self.portal_list.render()
+
+    def watch_launches(self):
+        self.launch_paused = False
+        self.launch_failed = 0
+        self.resume_btn.configure(text="Resume", state="disabled")
+        if not self.launch_polling:
+            self.launch_polling = True
+            self.after(100, self.drain_launches)
+
+    def drain_launches(self):
+        changed = False
+        while True:
+            try:
+                key, ok = self.launch_events.get_nowait()
+            except queue.Empty:
+                break
+            changed = True
+            self.launch_failed += not ok
+        if changed: self.portal_list.render()
+        left = self.launcher.remaining()
+        refused = f", browser refused {self.launch_failed}" if self.launch_failed else ""
+        if self.launch_paused:
+            self.launch_status.configure(text=f"Paused with {left} left{refused}")
+            self.resume_btn.configure(text=f"Resume ({left})" if left else "Resume", state="normal" if left else "disabled")
+        else:
+            self.launch_status.configure(text=(f"Opening… {left} left" if left else "All opened") + refused)
+        self.launch_polling = self.launcher.thread is not None or not self.launch_events.empty()
+        if self.launch_polling:
+            self.after(250, self.drain_launches)
+
+    def check_links(self):
+        # Checks the portals currently listed. Network checks run on a worker thread; results
+        # come back through a queue that the Tk thread drains with after().
+        urls = [p.url for p in self.portal_list.items]
+        self.link_btn.configure(state="disabled")
+        self.link_status.configure(text="Checking links…")
+        results = queue.Queue()
+        def work():
+            done = self.links.check(urls, progress=results.put)
+            results.put(done)
+        threading.Thread(target=work, daemon=True).start()
+        self.after(50, self.drain_links, results, 0, len(urls))
+
+    def drain_links(self, results, seen, total):
+        before = seen
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                break
+            if "url" not in item:
+                dead = sum(1 for r in item.values() if badge(r) == "dead")
+                self.link_status.configure(text=f"Checked {len(item)} links: {dead} broken, {self.links.requests} requests")
+                self.link_btn.configure(state="normal")
+                self.portal_list.render()
+                return
+            seen += 1
+            self.link_status.configure(text=f"Checking links… {seen}/{total}")
+        if seen != before: self.portal_list.render()
+        self.after(50, self.drain_links, results, seen, total)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Ludos — Privacy Toolkit")
+    p.add_argument("--startup-profile", action="store_true", help="print import/build timings and time-to-first-paint to stderr")
+    p.add_argument("--loop-monitor", action="store_true", help="report Tk main-loop stalls longer than one frame to stderr")
+    p.add_argument("--metrics", action="store_true", help="time the hot paths and print a summary to stderr at exit (also: LUDOS_METRICS=1)")
+    p.add_argument("--metrics-file", metavar="FILE", help="like --metrics, but append the numbers to FILE as one JSON line (also: LUDOS_METRICS=FILE)")
+    args = p.parse_args(argv)
+    if args.metrics or args.metrics_file:
+        enable_metrics(args.metrics_file)
+    app = App(profile=args.startup_profile, loop_monitor=args.loop_monitor)
+    app.mainloop()
+    if app.monitor:
+        print("main loop: " + ", ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in app.monitor.summary().items()), file=sys.stderr)
 
 if __name__ == "__main__":
-    App().mainloop()
\ No newline at end of file
+    main()
\ No newline at end of file
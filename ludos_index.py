@@ -0,0 +1,97 @@
+import json, os, sqlite3, threading, warnings
+from datetime import datetime
+
+from ludos_metrics import timed
+
+HOME = os.path.expanduser("~")
+INDEX_PATH = os.path.join(HOME, ".ludos_totp_index.json")
+INDEX_DB = os.path.join(HOME, ".ludos_totp_index.db")
+
+def _row(label, created=None, **meta):
+    return (label, created or datetime.utcnow().isoformat() + "Z", json.dumps(meta) if meta else None)
+
+def _meta(created, meta):
+    d = json.loads(meta) if meta else {}
+    d["created"] = created
+    return d
+
+class IndexStore:
+    # TOTP label index in SQLite. Every add/remove is one transaction touching one row;
+    # the legacy JSON index is imported once and then renamed to INDEX_PATH + ".migrated".
+    def __init__(self, path=INDEX_DB, legacy_path=INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS labels (label TEXT PRIMARY KEY, created TEXT NOT NULL, meta TEXT) WITHOUT ROWID")
+        if legacy_path and os.path.exists(legacy_path):
+            self.migrate(legacy_path)
+
+    @timed("index.migrate")
+    def migrate(self, legacy_path):
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+            if not isinstance(legacy, dict):
+                raise ValueError("index root is not an object")
+        except (OSError, ValueError) as e:
+            os.replace(legacy_path, legacy_path + ".corrupt")
+            warnings.warn(f"could not import {legacy_path} ({e}); kept as {legacy_path}.corrupt")
+            return 0
+        rows = [_row(k, **(v if isinstance(v, dict) else {})) for k, v in legacy.items()]
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.executemany("INSERT OR IGNORE INTO labels VALUES (?, ?, ?)", rows)
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        os.replace(legacy_path, legacy_path + ".migrated")
+        return len(rows)
+
+    @timed("index.add")
+    def add(self, label, created=None, **meta):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO labels VALUES (?, ?, ?)", _row(label, created, **meta))
+
+    @timed("index.remove")
+    def remove(self, label):
+        with self.lock:
+            return self.db.execute("DELETE FROM labels WHERE label = ?", (label,)).rowcount > 0
+
+    def get(self, label):
+        with self.lock:
+            row = self.db.execute("SELECT created, meta FROM labels WHERE label = ?", (label,)).fetchone()
+        return _meta(*row) if row else None
+
+    def labels(self):
+        with self.lock:
+            return [r[0] for r in self.db.execute("SELECT label FROM labels ORDER BY label")]
+
+    @timed("index.items")
+    def items(self):
+        with self.lock:
+            rows = self.db.execute("SELECT label, created, meta FROM labels ORDER BY label").fetchall()
+        return [(k, _meta(c, m)) for k, c, m in rows]
+
+    def __contains__(self, label):
+        with self.lock:
+            return self.db.execute("SELECT 1 FROM labels WHERE label = ?", (label,)).fetchone() is not None
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM labels").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+_store = None
+
+def default_store():
+    global _store
+    if _store is None:
+        _store = IndexStore()
+    return _store
@@ -0,0 +1,149 @@
+import json, os, queue, threading, time, webbrowser
+
+HOME = os.path.expanduser("~")
+SESSION_PATH = os.path.join(HOME, ".ludos_portal_session.json")
+
+class Launcher:
+    # Opens portal URLs from one worker thread through a single browser controller, resolved
+    # with webbrowser.get() on first use; open_new_tab() hands each URL to the running
+    # browser instead of starting one per click. Opens are spaced at least `interval`
+    # seconds apart. The session file records the keys still queued and when each key was
+    # opened, so an interrupted batch can be resumed. `progress(key, ok)` runs on the worker.
+    def __init__(self, session_path=SESSION_PATH, interval=1.5, browser=None, progress=None, clock=time.time, sleep=time.sleep):
+        self.session_path = session_path
+        self.interval = interval
+        self.browser = browser
+        self.progress = progress
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.jobs = queue.Queue()
+        self.controller = None
+        self.thread = None
+        self.last = None
+        self.gen = 0
+        self.opened = {}    # key -> unix time
+        self.pending = {}   # key -> url, in queue order
+        self.load()
+
+    def load(self):
+        if not self.session_path or not os.path.exists(self.session_path):
+            return
+        try:
+            with open(self.session_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.opened = {k: float(v) for k, v in data.get("opened", {}).items()}
+            self.pending = dict(data.get("pending", []))
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.opened, self.pending = {}, {}
+
+    def save(self):
+        if not self.session_path:
+            return
+        tmp = self.session_path + ".tmp"
+        with self.lock:   # the worker and the caller's thread both save
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"opened": self.opened, "pending": list(self.pending.items())}, f, indent=2)
+            os.replace(tmp, self.session_path)
+
+    def open(self, portals, skip_opened=False):
+        # Queues (key, url) pairs; returns how many were queued.
+        n = 0
+        with self.lock:
+            for key, url in portals:
+                if key in self.pending or (skip_opened and key in self.opened):
+                    continue
+                self.pending[key] = url
+                self.jobs.put((self.gen, key, url))
+                n += 1
+        if n:
+            self.save()
+            self._start()
+        return n
+
+    def resume(self):
+        # Requeues whatever a pause, or the last session, left pending.
+        with self.lock:
+            self.gen += 1
+            left = list(self.pending.items())
+            self.pending.clear()
+        return self.open(left)
+
+    def pause(self):
+        # Stops after the URL being opened right now; the rest stays pending for resume().
+        with self.lock:
+            self.gen += 1
+
+    def cancel(self):
+        with self.lock:
+            self.gen += 1
+            self.pending.clear()
+        self.save()
+
+    def reset(self):
+        self.cancel()
+        with self.lock:
+            self.opened.clear()
+        self.save()
+
+    def remaining(self):
+        with self.lock:
+            return len(self.pending)
+
+    def opened_at(self, key):
+        with self.lock:
+            return self.opened.get(key)
+
+    def _start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def wait(self, timeout=None):
+        t = self.thread
+        if t: t.join(timeout)
+
+    def run(self):
+        try:
+            while True:
+                try:
+                    gen, key, url = self.jobs.get(timeout=1)
+                except queue.Empty:
+                    with self.lock:   # open() queues under the lock, so nothing can slip in
+                        if self.jobs.empty():
+                            self.thread = None
+                            return
+                    continue
+                if not self._live(gen, key):
+                    continue   # left queued by pause() or cancel(): drop without waiting
+                if self.last is not None:
+                    delay = self.last + self.interval - self.clock()
+                    if delay > 0: self.sleep(delay)
+                if not self._live(gen, key):
+                    continue   # paused or cancelled while waiting its turn
+                try:
+                    if self.controller is None:
+                        self.controller = webbrowser.get(self.browser)
+                    ok = self.controller.open_new_tab(url)
+                except webbrowser.Error:
+                    ok = False
+                self.last = self.clock()
+                with self.lock:
+                    self.pending.pop(key, None)
+                    if ok: self.opened[key] = self.last
+                try:
+                    self.save()
+                except OSError:
+                    pass   # the session file is only for resuming; keep opening
+                if self.progress: self.progress(key, ok)
+        finally:
+            # However the worker ends, let the next open() start a new one.
+            with self.lock:
+                if self.thread is threading.current_thread():
+                    self.thread = None
+
+    def _live(self, gen, key):
+        with self.lock:
+            return gen == self.gen and key in self.pending
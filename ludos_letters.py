@@ -0,0 +1,145 @@
+import csv, json, os, re, textwrap, threading, time, zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from ludos_metrics import span, timed
+from ludos_portals import default_registry
+
+# Dedented once at import; rendering is a single str.format call.
+DMCA_TEMPLATE = textwrap.dedent("""
+    To Whom It May Concern,
+
+    I am the copyright owner of the material identified below. I request removal or disabling of access to infringing content under 17 U.S.C. § 512(c).
+
+    Original work: {original_desc}
+    Infringing URLs:
+    {infringing_urls}
+
+    My contact information:
+    Name: {name}
+    Email: {email}
+
+    I have a good-faith belief that the use of the material is not authorized by the copyright owner, its agent, or the law.
+    The information in this notice is accurate, and under penalty of perjury, I am authorized to act on behalf of the owner.
+
+    Signature: {signature_name}
+    Date: {date}
+""").strip()
+
+ERASURE_TEMPLATE = textwrap.dedent("""
+    Hello,
+
+    I am exercising my right to deletion under {law}. Please delete all personal data related to me across your systems, including backups when feasible, and confirm completion.
+
+    Identifiers:
+    {identifiers}
+
+    Contact:
+    Name: {name}
+    Email: {email}
+
+    Please confirm receipt and completion within the statutory period and describe any data you are legally required to retain.
+""").strip()
+
+@timed("letters.dmca")
+def dmca_letter(name, email, infringing_urls, original_desc, signature_name, date=None):
+    return DMCA_TEMPLATE.format(name=name, email=email, infringing_urls=os.linesep.join(infringing_urls),
+                                original_desc=original_desc, signature_name=signature_name,
+                                date=date or datetime.utcnow().date().isoformat())
+
+@timed("letters.erasure")
+def privacy_erasure_letter(name, email, identifiers, law, recipient=None):
+    letter = ERASURE_TEMPLATE.format(name=name, email=email, identifiers=os.linesep.join(identifiers), law=law)
+    return f"To: {recipient}\n\n{letter}" if recipient else letter
+
+def unique_path(directory, prefix, ext=".txt"):
+    # <prefix>_<unix time>.txt, adding _2, _3, ... rather than overwriting a letter
+    # written in the same second. Creates the file so the name stays reserved.
+    base = os.path.join(directory, f"{prefix}_{int(time.time())}")
+    n = 1
+    while True:
+        path = base + (f"_{n}" if n > 1 else "") + ext
+        try:
+            with open(path, "x", encoding="utf-8"):
+                return path
+        except FileExistsError:
+            n += 1
+
+def _split(value):
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in re.split(r"[;,\n]", value or "") if v.strip()]
+
+def read_rows(path, fmt=None):
+    # Streams dict rows from CSV (header row) or NDJSON (one object per line).
+    fmt = fmt or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def render_rows(rows, brokers=False):
+    # Yields (slug, letter). Rows need name and email; "kind" is "erasure" (default) or
+    # "dmca". With brokers=True every erasure row fans out to one letter per data broker
+    # in the portal registry.
+    date = datetime.utcnow().date().isoformat()
+    broker_urls = default_registry().urls("broker") if brokers else None
+    for i, row in enumerate(rows, 1):
+        name, email = (row.get("name") or "").strip(), (row.get("email") or "").strip()
+        if not (name and email):
+            raise ValueError(f"row {i}: name and email are required")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower() or "client"
+        if (row.get("kind") or "erasure").strip().lower() == "dmca":
+            urls = _split(row.get("infringing_urls"))
+            if not urls:
+                raise ValueError(f"row {i}: dmca rows need infringing_urls")
+            yield f"dmca_{i:06d}_{slug}", dmca_letter(name, email, urls,
+                row.get("original_desc") or "Description of the original work owned by me.",
+                row.get("signature_name") or name, date)
+            continue
+        ids = _split(row.get("identifiers")) or [email]
+        law = row.get("law") or "GDPR"
+        if brokers:
+            for key, url in broker_urls.items():
+                yield f"erasure_request_{i:06d}_{slug}_{key}", privacy_erasure_letter(name, email, ids, law, f"{key} ({url})")
+        else:
+            yield f"erasure_request_{i:06d}_{slug}", privacy_erasure_letter(name, email, ids, law, row.get("recipient"))
+
+def _write_file(directory, slug, letter):
+    with span("letters.write_file"), open(os.path.join(directory, slug + ".txt"), "x", encoding="utf-8") as f:
+        f.write(letter)
+
+@timed("letters.write_all")
+def write_letters(letters, out, workers=8, progress=None, every=1000):
+    # Writes (slug, letter) pairs to a directory through a thread pool with at most
+    # 4 * workers writes in flight, or sequentially into a zip archive when `out` ends in
+    # .zip. Slugs carry the row number, so names never collide within a run; existing
+    # files are never overwritten. Returns the number of letters written.
+    done = 0
+    if out.endswith(".zip"):
+        with zipfile.ZipFile(out, "x", zipfile.ZIP_DEFLATED) as zf:
+            for slug, letter in letters:
+                zf.writestr(slug + ".txt", letter)
+                done += 1
+                if progress and done % every == 0: progress(done)
+    else:
+        os.makedirs(out, exist_ok=True)
+        slots = threading.BoundedSemaphore(workers * 4)
+        with ThreadPoolExecutor(workers) as pool:
+            futures = []
+            for slug, letter in letters:
+                slots.acquire()
+                fut = pool.submit(_write_file, out, slug, letter)
+                fut.add_done_callback(lambda _: slots.release())
+                futures.append(fut)
+                done += 1
+                if progress and done % every == 0: progress(done)
+                if len(futures) >= 1024:
+                    for fut in futures: fut.result()
+                    futures.clear()
+            for fut in futures: fut.result()
+    if progress: progress(done)
+    return done
@@ -0,0 +1,169 @@
+import http.client, json, os, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlsplit
+
+from ludos_portals import default_registry
+
+HOME = os.path.expanduser("~")
+CACHE_PATH = os.path.join(HOME, ".ludos_links_cache.json")
+USER_AGENT = "Mozilla/5.0 (compatible; ludos-linkcheck)"
+MAX_DRAIN = 1 << 20
+
+def all_portals():
+    return default_registry().urls()
+
+def badge(result):
+    # "ok" for 2xx/3xx, "blocked" when the site refuses bots (401/403/429), else "dead".
+    if result is None:
+        return "unknown"
+    status = result.get("status") or 0
+    if 200 <= status < 400:
+        return "ok"
+    if status in (401, 403, 429):
+        return "blocked"
+    return "dead"
+
+def _target(url):
+    # (split url, connection key); ValueError unless it is an http(s) URL with a host.
+    parts = urlsplit(url) if isinstance(url, str) else None
+    if parts is None or parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"invalid URL: {url!r}")
+    return parts, (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+
+class LinkChecker:
+    # Checks URLs from a thread pool (at most `per_host` requests per host at a time),
+    # reusing keep-alive connections per host and following redirects. Results are cached
+    # in `cache_path`; entries younger than `ttl` are returned without a request, older ones
+    # are revalidated with If-None-Match / If-Modified-Since. Network errors are never served
+    # from the cache.
+    def __init__(self, cache_path=CACHE_PATH, ttl=24 * 3600, workers=16, per_host=2, timeout=10, max_redirects=5, clock=time.time):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.hosts = {}
+        self.requests = 0
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError):
+                self.cache = {}
+
+    def save(self):
+        if not self.cache_path:
+            return
+        tmp = self.cache_path + ".tmp"
+        with self.lock:
+            data = json.dumps(self.cache, indent=2, sort_keys=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.cache_path)
+
+    def cached(self, url):
+        return self.cache.get(url)
+
+    def _host_slot(self, key):
+        with self.lock:
+            sem = self.hosts.get(key)
+            if sem is None:
+                sem = self.hosts[key] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def _connection(self, key):
+        with self.lock:
+            conns = self.idle.get(key)
+            if conns:
+                return conns.pop()
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout)
+
+    def _release(self, key, conn):
+        with self.lock:
+            self.idle.setdefault(key, []).append(conn)
+
+    def _request(self, method, url, headers):
+        parts, key = _target(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        with self._host_slot(key):
+            for attempt in (0, 1):
+                conn = self._connection(key)
+                try:
+                    conn.request(method, path, headers={"User-Agent": USER_AGENT, "Accept": "*/*", **headers})
+                    resp = conn.getresponse()
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    conn.close()
+                    if attempt: raise
+                    continue  # a pooled keep-alive connection went stale; retry on a fresh one
+                except Exception:
+                    conn.close()
+                    raise
+                with self.lock: self.requests += 1
+                body = resp.read(MAX_DRAIN + 1)
+                if resp.will_close or len(body) > MAX_DRAIN:
+                    conn.close()
+                else:
+                    self._release(key, conn)
+                return resp.status, resp.headers
+
+    def _check(self, url):
+        now = self.clock()
+        try:
+            _target(url)
+        except ValueError as e:
+            return {"url": url, "checked": now, "status": None, "final_url": url, "error": str(e), "cached": False}
+        prev = self.cache.get(url)
+        if prev and prev.get("status") and now - prev.get("checked", 0) < self.ttl:
+            return dict(prev, cached=True)
+        headers = {}
+        if prev and badge(prev) == "ok":
+            if prev.get("etag"): headers["If-None-Match"] = prev["etag"]
+            if prev.get("last_modified"): headers["If-Modified-Since"] = prev["last_modified"]
+        result = {"url": url, "checked": now}
+        target, method = url, "HEAD"
+        try:
+            for _ in range(self.max_redirects + 1):
+                status, h = self._request(method, target, headers if target == url else {})
+                if status in (405, 501) and method == "HEAD":
+                    method = "GET"
+                    status, h = self._request(method, target, headers if target == url else {})
+                if status in (301, 302, 303, 307, 308) and h.get("Location"):
+                    target = urljoin(target, h["Location"])
+                    continue
+                break
+            else:
+                raise ValueError(f"more than {self.max_redirects} redirects")
+            if status == 304 and prev:
+                result = dict(prev, checked=now)
+            else:
+                result.update(status=status, final_url=target, etag=h.get("ETag"), last_modified=h.get("Last-Modified"))
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            result.update(status=None, final_url=target, error=str(e) or type(e).__name__)
+        with self.lock:
+            self.cache[url] = result
+        return dict(result, cached=False)
+
+    def check(self, urls, progress=None):
+        # Returns {url: result}; progress(result) is called from worker threads as each
+        # URL finishes.
+        results = {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            for fut in as_completed([pool.submit(self._check, u) for u in dict.fromkeys(urls)]):
+                r = fut.result()
+                results[r["url"]] = r
+                if progress: progress(r)
+        self.save()
+        return results
+
+    def close(self):
+        with self.lock:
+            for conns in self.idle.values():
+                for c in conns: c.close()
+            self.idle.clear()
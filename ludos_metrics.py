@@ -0,0 +1,124 @@
+import atexit, functools, json, os, random, sys, threading, time
+
+# Opt-in instrumentation: timing spans and counters for the hot paths. Off unless
+# $LUDOS_METRICS is set at import (a file path for a JSON dump at exit, or "1" for a
+# summary on stderr) or enable() is called, e.g. from a --metrics flag. While off, timed()
+# costs one flag check per call and span()/count() return immediately.
+
+RESERVOIR = 2048   # latency samples kept per span for percentiles
+
+_lock = threading.Lock()
+_spans = {}       # name -> [count, total, max, samples]
+_counters = {}
+_enabled = False
+_path = None
+_registered = False
+
+def enabled():
+    return _enabled
+
+def enable(path=None):
+    # path: JSON file written at exit; None prints a summary to stderr instead.
+    global _enabled, _path, _registered
+    _enabled = True
+    _path = path
+    if not _registered:
+        _registered = True
+        atexit.register(_at_exit)
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+def record(name, seconds):
+    with _lock:
+        s = _spans.get(name)
+        if s is None:
+            s = _spans[name] = [0, 0.0, 0.0, []]
+        s[0] += 1
+        s[1] += seconds
+        if seconds > s[2]: s[2] = seconds
+        if len(s[3]) < RESERVOIR:
+            s[3].append(seconds)
+        else:
+            i = random.randrange(s[0])
+            if i < RESERVOIR: s[3][i] = seconds
+
+def count(name, n=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+class span:
+    # with span("letters.write"): ...  Records nothing while metrics are off.
+    __slots__ = ("name", "t")
+
+    def __init__(self, name):
+        self.name = name
+        self.t = None
+
+    def __enter__(self):
+        if _enabled: self.t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.t is not None:
+            record(self.name, time.perf_counter() - self.t)
+
+def timed(name):
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t)
+        return inner
+    return wrap
+
+def snapshot():
+    with _lock:
+        spans = {}
+        for name, (n, total, peak, samples) in sorted(_spans.items()):
+            ordered = sorted(samples)
+            pick = lambda p: ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1e6
+            spans[name] = {"count": n, "total_s": total, "mean_us": total / n * 1e6,
+                           "p50_us": pick(50), "p95_us": pick(95), "max_us": peak * 1e6}
+        return {"pid": os.getpid(), "time": time.time(), "spans": spans, "counters": dict(sorted(_counters.items()))}
+
+def summary(out=sys.stderr):
+    snap = snapshot()
+    if snap["spans"]:
+        print(f"{'span':<32}{'count':>9}{'total s':>10}{'mean us':>10}{'p50 us':>10}{'p95 us':>10}{'max us':>11}", file=out)
+    for name, s in snap["spans"].items():
+        print(f"{name:<32}{s['count']:>9}{s['total_s']:>10.3f}{s['mean_us']:>10.1f}{s['p50_us']:>10.1f}{s['p95_us']:>10.1f}{s['max_us']:>11.1f}", file=out)
+    if snap["counters"]:
+        print(f"{'counter':<32}{'count':>9}", file=out)
+    for name, n in snap["counters"].items():
+        print(f"{name:<32}{n:>9}", file=out)
+
+def dump(path):
+    # Appends one JSON line per process, so repeated runs accumulate in one file.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(snapshot()) + "\n")
+
+def _at_exit():
+    if not _enabled:
+        return
+    if _path:
+        dump(_path)
+    else:
+        summary()
+
+_env = os.environ.get("LUDOS_METRICS")
+if _env:
+    enable(None if _env.lower() in ("1", "true", "yes", "stderr") else _env)
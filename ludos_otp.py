@@ -0,0 +1,95 @@
+import base64, hashlib, hmac, secrets, struct, time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+ALGORITHMS = {"SHA1": hashlib.sha1, "SHA256": hashlib.sha256, "SHA512": hashlib.sha512}
+_COUNTER = struct.Struct(">Q")
+
+def decode_secret(secret):
+    s = secret.replace(" ", "").replace("-", "").upper()
+    try:
+        key = base64.b32decode(s + "=" * (-len(s) % 8))
+    except ValueError:
+        raise ValueError("secret is not valid Base32")
+    if not key:
+        raise ValueError("secret is empty")
+    return key
+
+def random_secret(nbytes=20):
+    return base64.b32encode(secrets.token_bytes(nbytes)).decode("ascii").rstrip("=")
+
+class Otp:
+    # RFC 6238 time-based codes (on top of the RFC 4226 HOTP function). The Base32 secret
+    # is decoded and the HMAC keyed once; each code costs one hmac copy() plus an 8-byte
+    # update. Same at()/now() surface as pyotp.TOTP.
+    def __init__(self, secret, digits=6, period=30, algorithm="SHA1", label=None, issuer=None):
+        algorithm = algorithm.upper()
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unsupported algorithm {algorithm} (use SHA1, SHA256 or SHA512)")
+        if not 6 <= int(digits) <= 10 or int(period) <= 0:
+            raise ValueError("digits must be 6-10 and period positive")
+        self.mac = hmac.new(decode_secret(secret), digestmod=ALGORITHMS[algorithm])
+        self.digits, self.period, self.algorithm = int(digits), int(period), algorithm
+        self.mod = 10 ** self.digits
+        self.label, self.issuer = label, issuer
+
+    def _code(self, msg):
+        # Dynamic truncation (RFC 4226 5.3) of the HMAC of one packed counter.
+        m = self.mac.copy()
+        m.update(msg)
+        d = m.digest()
+        o = d[-1] & 0x0F
+        return str((int.from_bytes(d[o:o + 4], "big") & 0x7FFFFFFF) % self.mod).zfill(self.digits)
+
+    def hotp(self, counter):
+        return self._code(_COUNTER.pack(counter))
+
+    def at(self, for_time, steps=0):
+        return self.hotp(int(for_time) // self.period + steps)
+
+    def now(self):
+        return self.at(time.time())
+
+    def window(self, for_time, steps):
+        c = int(for_time) // self.period
+        return [self.hotp(c + s) for s in steps]
+
+    def verify(self, code, for_time=None, drift=1):
+        for_time = time.time() if for_time is None else for_time
+        return any(hmac.compare_digest(c, str(code)) for c in self.window(for_time, range(-drift, drift + 1)))
+
+def parse_uri(uri):
+    # otpauth://totp/Issuer:account?secret=...&issuer=...&algorithm=SHA256&digits=8&period=60
+    # Counter-based otpauth://hotp URIs are rejected: their codes depend on a counter that
+    # has to be stored and advanced on every use, not on the time.
+    parts = urlsplit(uri)
+    if parts.scheme == "otpauth" and parts.netloc == "hotp":
+        raise ValueError("HOTP (counter-based) secrets are not supported; use a TOTP secret")
+    if parts.scheme != "otpauth" or parts.netloc != "totp":
+        raise ValueError("not an otpauth://totp URI")
+    q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+    if "secret" not in q:
+        raise ValueError("otpauth URI has no secret")
+    label = unquote(parts.path.lstrip("/"))
+    issuer = q.get("issuer")
+    if ":" in label:
+        prefix, label = label.split(":", 1)
+        issuer = issuer or prefix
+    return Otp(q["secret"], q.get("digits", 6), q.get("period", 30), q.get("algorithm", "SHA1"), label.strip(), issuer)
+
+def from_stored(value):
+    # Stored secrets are either a bare Base32 string or a full otpauth:// URI.
+    return parse_uri(value) if value.startswith("otpauth://") else Otp(value)
+
+def batch(otps, for_time, steps=(0,)):
+    # {label: [code per step]} for many labels and windows in one call, e.g.
+    # steps=range(-1, 2) for +/-1 step of clock drift. Counters are packed once per
+    # distinct period rather than per label.
+    packed = {}
+    out = {}
+    for label, otp in otps.items():
+        counters = packed.get(otp.period)
+        if counters is None:
+            c = int(for_time) // otp.period
+            counters = packed[otp.period] = [_COUNTER.pack(c + s) for s in steps]
+        out[label] = [otp._code(msg) for msg in counters]
+    return out
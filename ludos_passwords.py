@@ -0,0 +1,96 @@
+import os, secrets, string
+
+from ludos_metrics import count, timed
+
+UPPER = string.ascii_uppercase
+LOWER = string.ascii_lowercase
+DIGITS = string.digits
+SYMBOLS = "!@#$%^&*()-_=+[]{};:,<.>/?"
+CLASSES = {"u": UPPER, "l": LOWER, "d": DIGITS, "s": SYMBOLS}
+
+def parse_classes(spec):
+    spec = (spec or "ulds").lower()
+    bad = set(spec) - set(CLASSES)
+    if bad:
+        raise ValueError(f"unknown character classes: {''.join(sorted(bad))} (use u, l, d, s)")
+    return tuple(c in spec for c in "ulds")
+
+def _pools(use_upper, use_lower, use_digits, use_symbols):
+    pools = []
+    if use_upper: pools.append(UPPER)
+    if use_lower: pools.append(LOWER)
+    if use_digits: pools.append(DIGITS)
+    if use_symbols: pools.append(SYMBOLS)
+    return pools
+
+@timed("passwords.strong_password")
+def strong_password(length=24, use_upper=True, use_lower=True, use_digits=True, use_symbols=True):
+    pools = _pools(use_upper, use_lower, use_digits, use_symbols)
+    pool = "".join(pools) if pools else string.ascii_letters + string.digits
+    while True:
+        chars = []
+        for s in pools: chars.append(secrets.choice(s))
+        chars += [secrets.choice(pool) for _ in range(max(0, length - len(chars)))]
+        secrets.SystemRandom().shuffle(chars)
+        pw = "".join(chars[:length])
+        if not pools or all(any(c in pw for c in s) for s in pools): return pw
+
+class Entropy:
+    # Buffered os.urandom reader. Each alphabet gets its own stream of already-mapped
+    # characters: bytes >= 256 - 256 % len(alphabet) are dropped (rejection sampling),
+    # the rest map to alphabet[b % len(alphabet)], all inside one bytes.translate call.
+    def __init__(self, bufsize=1 << 16):
+        self.bufsize = bufsize
+        self.tables = {}
+        self.streams = {}
+
+    def _table(self, alphabet):
+        t = self.tables.get(alphabet)
+        if t is None:
+            m = len(alphabet)
+            if not 0 < m <= 256:
+                raise ValueError("alphabet must have 1..256 symbols")
+            limit = 256 - 256 % m
+            table = bytes(ord(alphabet[b % m]) if b < limit else 0 for b in range(256))
+            t = self.tables[alphabet] = (table, bytes(range(limit, 256)))
+        return t
+
+    def draw(self, alphabet, count):
+        buf, pos = self.streams.get(alphabet, ("", 0))
+        if len(buf) - pos < count:
+            table, reject = self._table(alphabet)
+            parts = [buf[pos:]]
+            have = len(parts[0])
+            while have < count:
+                chunk = os.urandom(max(self.bufsize, count)).translate(table, reject).decode("latin-1")
+                parts.append(chunk)
+                have += len(chunk)
+            buf, pos = "".join(parts), 0
+        self.streams[alphabet] = (buf, pos + count)
+        return buf[pos:pos + count]
+
+    def below(self, n):
+        if n > 256:
+            return secrets.randbelow(n)
+        return ord(self.draw(_INDEX_ALPHABETS[n], 1))
+
+_INDEX_ALPHABETS = [None] + ["".join(map(chr, range(n))) for n in range(1, 257)]
+
+def strong_passwords(n, length=24, use_upper=True, use_lower=True, use_digits=True, use_symbols=True, entropy=None):
+    pools = _pools(use_upper, use_lower, use_digits, use_symbols)
+    pool = "".join(pools) if pools else string.ascii_letters + string.digits
+    if length < len(pools):
+        raise ValueError(f"length {length} cannot hold one character from each of {len(pools)} classes")
+    rng = entropy or Entropy()
+    fill = length - len(pools)
+    made = 0
+    try:
+        for made in range(1, n + 1):
+            # Required characters are inserted at uniform positions into an i.i.d. filler,
+            # which gives the same distribution as shuffling, without retries.
+            chars = list(rng.draw(pool, fill))
+            for s in pools:
+                chars.insert(rng.below(len(chars) + 1), rng.draw(s, 1))
+            yield "".join(chars)
+    finally:
+        count("passwords.generated", made)   # what was taken, once the caller is done
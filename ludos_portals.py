@@ -0,0 +1,162 @@
+import bisect, json, os, re, warnings
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+HOME = os.path.expanduser("~")
+PORTALS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "portals.json")
+USER_PORTALS = os.environ.get("LUDOS_PORTALS") or os.path.join(HOME, ".ludos_portals.json")
+CATEGORIES = {"account": "Account Deletion", "broker": "Data Brokers", "search": "Search/Removal"}
+
+Portal = namedtuple("Portal", "key name url category regions tags")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def tokens(text):
+    return _TOKEN.findall(text.lower())
+
+def _deletes(token):
+    # The token plus every single-character deletion: tokens within one insertion,
+    # deletion, substitution or adjacent swap of each other share a variant.
+    return {token, *(token[:i] + token[i + 1:] for i in range(len(token)))}
+
+def _portal(e):
+    return Portal(e["key"], e.get("name") or e["key"], e["url"], e.get("category", "broker"),
+                  tuple(e.get("regions") or ()), tuple(e.get("tags") or ()))
+
+class Registry:
+    # Portal entries from JSON files (a list of {key, name, url, category, regions, tags};
+    # later files override earlier ones by key). The search index is built on first use:
+    # token -> entry ids and a sorted vocabulary bisected for prefix matches. Terms with no
+    # prefix match fall back to a one-typo lookup through single-deletion variants, an
+    # index built the first time it is needed.
+    def __init__(self, entries=()):
+        self.entries = []
+        self.by_key = {}
+        self.postings = self.variants = None
+        for e in entries:
+            self.add(e)
+
+    @classmethod
+    def load(cls, *paths):
+        # Unreadable files and malformed entries are skipped with a warning, so a broken
+        # user registry cannot take the bundled portals down with it.
+        reg = cls()
+        for path in paths:
+            if not path or not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if not isinstance(entries, list):
+                    raise ValueError("expected a list of portal entries")
+            except (OSError, ValueError) as e:
+                warnings.warn(f"skipped portal registry {path}: {e}")
+                continue
+            for n, e in enumerate(entries, 1):
+                try:
+                    reg.add(e)
+                except (KeyError, TypeError, AttributeError) as err:
+                    warnings.warn(f"{path}: skipped malformed entry {n} ({err!r})")
+        return reg
+
+    def add(self, entry):
+        p = entry if isinstance(entry, Portal) else _portal(entry)
+        i = self.by_key.get(p.key)
+        if i is None:
+            self.by_key[p.key] = len(self.entries)
+            self.entries.append(p)
+        else:
+            self.entries[i] = p
+        self.postings = self.variants = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def get(self, key):
+        i = self.by_key.get(key)
+        return None if i is None else self.entries[i]
+
+    def urls(self, category=None):
+        return {p.key: p.url for p in self.entries if category is None or p.category == category}
+
+    def _build(self):
+        postings = {}
+        for i, p in enumerate(self.entries):
+            text = " ".join((p.key, p.name, urlsplit(p.url).hostname or "", p.category, *p.regions, *p.tags))
+            for t in set(tokens(text)):
+                postings.setdefault(t, []).append(i)
+        self.vocab = sorted(postings)
+        self.postings = postings
+        self.variants = None
+
+    def _build_variants(self):
+        variants = {}
+        for t in self.vocab:
+            if len(t) >= 3:
+                for v in _deletes(t):
+                    variants.setdefault(v, []).append(t)
+        self.variants = variants
+
+    def prepare(self):
+        # Builds both indexes up front (e.g. from a worker thread) so the first typo does
+        # not pay for the variant index.
+        if self.postings is None: self._build()
+        if self.variants is None: self._build_variants()
+
+    def _match(self, term):
+        # entry id -> score: 3 for an exact token, 2 for a prefix, 1 for a one-typo match.
+        scores = {}
+        lo = bisect.bisect_left(self.vocab, term)
+        hi = bisect.bisect_left(self.vocab, term + "{", lo)   # "{" sorts after [a-z0-9]
+        for t in self.vocab[lo:hi]:
+            s = 3 if t == term else 2
+            for i in self.postings[t]:
+                if scores.get(i, 0) < s: scores[i] = s
+        if not scores and len(term) >= 3:
+            if self.variants is None:
+                self._build_variants()
+            for v in _deletes(term):
+                for t in self.variants.get(v, ()):
+                    for i in self.postings[t]:
+                        scores[i] = 1
+        return scores
+
+    def search(self, query="", category=None, limit=None):
+        # Every term must match (as a prefix, or fuzzily); results are ranked by summed
+        # score, then key. An empty query lists the registry in file order.
+        if self.postings is None:
+            self._build()
+        terms = tokens(query)
+        if terms:
+            total = None
+            for term in terms:
+                s = self._match(term)
+                total = s if total is None else {i: v + s[i] for i, v in total.items() if i in s}
+                if not total:
+                    return []
+            order = sorted(total, key=lambda i: (-total[i], self.entries[i].key))
+        else:
+            order = range(len(self.entries))
+        hits = [self.entries[i] for i in order if category is None or self.entries[i].category == category]
+        return hits[:limit] if limit else hits
+
+_registry = None
+
+def default_registry():
+    # The bundled portals.json plus the user's registry ($LUDOS_PORTALS or ~/.ludos_portals.json).
+    global _registry
+    if _registry is None:
+        _registry = Registry.load(PORTALS_PATH, USER_PORTALS)
+    return _registry
+
+_LEGACY = {"ACCOUNT_PAGES": "account", "DATA_BROKERS": "broker", "REMOVAL_PORTALS": "search"}
+
+def __getattr__(name):
+    # The old per-category dicts, built from the registry on first access rather than at
+    # import, so importing this module never reads the user's file.
+    if name in _LEGACY:
+        return default_registry().urls(_LEGACY[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
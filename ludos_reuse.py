@@ -0,0 +1,177 @@
+import hashlib, math, mmap, os, struct
+
+HEADER = struct.Struct("<8s16sdIQ")   # magic, salt, target fp rate, growth factor, first stage capacity
+STAGE = struct.Struct("<QQII")        # bits, capacity, hashes, items
+MAGIC = b"LUDOSRG1"
+TIGHTEN = 0.5                         # fp rate ratio between consecutive stages
+FILTER_NAME = "issued.bloom"
+
+def _hashes(salt, pw):
+    # Seeds for enhanced double hashing; plain h1 + i*h2 measurably overshoots the fp rate
+    # at the large k of the later stages.
+    d = hashlib.blake2b(pw.encode("utf-8"), key=salt, digest_size=16).digest()
+    return int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little") | 1
+
+class ScalableBloom:
+    # Scalable Bloom filter (Almeida et al.) over salted BLAKE2b hashes, kept in one mmapped
+    # file. Stage i holds initial * growth**i items at an fp rate of fp * (1 - r) * r**i, so
+    # the compound fp rate stays under `fp` however many stages are added and memory grows
+    # linearly with the items (3-4 bytes each at the default 1e-4). Writes land in the
+    # mapping; flush() pushes them to disk.
+    def __init__(self, path, fp=1e-4, growth=2, initial=1024):
+        self.path = path
+        new = not os.path.exists(path) or os.path.getsize(path) < HEADER.size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if new:
+            os.ftruncate(self.fd, 0)
+            os.write(self.fd, HEADER.pack(MAGIC, os.urandom(16), fp, growth, initial))
+        self.mm = mmap.mmap(self.fd, 0)
+        magic, self.salt, self.fp, self.growth, self.initial = HEADER.unpack_from(self.mm)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Ludos reuse filter")
+        self.stages = []   # (header offset, bits, capacity, hashes)
+        off, size = HEADER.size, len(self.mm)
+        while off < size:
+            m = cap = k = 0
+            if off + STAGE.size <= size:
+                m, cap, k, _ = STAGE.unpack_from(self.mm, off)
+            if m <= 0 or k <= 0 or cap <= 0 or off + self._stage_size(m) > size:
+                break
+            self.stages.append((off, m, cap, k))
+            off += self._stage_size(m)
+        if off < size:
+            # A stage cut short by a crash while it was being added. _add_stage writes the
+            # header before extending the file, so only this last stage can be incomplete
+            # and no item reached it; drop it.
+            self.mm.close()
+            os.ftruncate(self.fd, off)
+            self.mm = mmap.mmap(self.fd, 0)
+
+    @staticmethod
+    def _stage_size(m):
+        return STAGE.size + ((m + 63) // 64) * 8
+
+    def _add_stage(self):
+        i = len(self.stages)
+        cap = self.initial * self.growth ** i
+        p = self.fp * (1 - TIGHTEN) * TIGHTEN ** i
+        m = math.ceil(-cap * math.log(p) / math.log(2) ** 2)
+        k = max(1, math.ceil(-math.log2(p)))
+        off = len(self.mm)
+        self.mm.close()
+        # Header first, then the zeroed bits: a crash in between leaves a stage that runs
+        # past the end of the file, which the next open drops.
+        os.pwrite(self.fd, STAGE.pack(m, cap, k, 0), off)
+        os.ftruncate(self.fd, off + self._stage_size(m))
+        self.mm = mmap.mmap(self.fd, 0)
+        self.stages.append((off, m, cap, k))
+
+    def _items(self, off):
+        return STAGE.unpack_from(self.mm, off)[3]
+
+    def __contains__(self, pw):
+        h1, h2 = _hashes(self.salt, pw)
+        mm = self.mm
+        for off, m, _, k in self.stages:
+            base = off + STAGE.size
+            for i in range(k):
+                b = (h1 + i * h2 + (i * i * i - i) // 6) % m
+                if not mm[base + (b >> 3)] & (1 << (b & 7)):
+                    break
+            else:
+                return True
+        return False
+
+    def add(self, pw):
+        if not self.stages or self._items(self.stages[-1][0]) >= self.stages[-1][2]:
+            self._add_stage()
+        off, m, cap, k = self.stages[-1]
+        h1, h2 = _hashes(self.salt, pw)
+        base = off + STAGE.size
+        mm = self.mm
+        for i in range(k):
+            b = (h1 + i * h2 + (i * i * i - i) // 6) % m
+            mm[base + (b >> 3)] |= 1 << (b & 7)
+        STAGE.pack_into(mm, off, m, cap, k, self._items(off) + 1)
+
+    def __len__(self):
+        return sum(self._items(off) for off, *_ in self.stages)
+
+    def stats(self):
+        # `fp_bound` is the configured ceiling; `fp_estimate` is the current rate from each
+        # stage's fill (1 - e^(-kn/m))^k.
+        miss = 1.0
+        for off, m, _, k in self.stages:
+            miss *= 1 - (1 - math.exp(-k * self._items(off) / m)) ** k
+        return {"items": len(self), "stages": len(self.stages), "bytes": len(self.mm),
+                "fp_bound": self.fp, "fp_estimate": 1 - miss}
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.flush()
+            self.mm.close()
+            self.mm = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class ReuseGuard:
+    # One ScalableBloom per schedule, stored as issued.bloom in the schedule's rotation log
+    # directory. It survives log retention, so it remembers every password ever issued;
+    # a missing filter is rebuilt from whatever the log still holds.
+    def __init__(self, logs, **opts):
+        self.logs = logs
+        self.opts = opts
+        self.filters = {}
+
+    def _path(self, name):
+        return os.path.join(self.logs.path(name), FILTER_NAME)
+
+    def get(self, name):
+        f = self.filters.get(name)
+        if f is None:
+            path = self._path(name)
+            if not os.path.exists(path):
+                return self.rebuild(name)
+            try:
+                f = self.filters[name] = ScalableBloom(path, **self.opts)
+            except ValueError:
+                return self.rebuild(name)   # not a filter (bad magic): start over from the log
+        return f
+
+    def rebuild(self, name):
+        old = self.filters.pop(name, None)
+        if old is not None: old.close()
+        log = self.logs.get(name)   # creates the directory if needed
+        path = self._path(name)
+        tmp = path + ".tmp"
+        if os.path.exists(tmp): os.remove(tmp)
+        f = ScalableBloom(tmp, **self.opts)
+        for _, pw in log.records():
+            f.add(pw)
+        f.close()
+        os.replace(tmp, path)
+        f = self.filters[name] = ScalableBloom(path, **self.opts)
+        return f
+
+    def seen(self, name, pw):
+        return pw in self.get(name)
+
+    def add(self, name, pw):
+        self.get(name).add(pw)
+
+    def stats(self, name):
+        return self.get(name).stats()
+
+    def sync(self):
+        for f in self.filters.values():
+            f.flush()
+
+    def close(self):
+        for f in self.filters.values():
+            f.close()
+        self.filters.clear()
@@ -0,0 +1,180 @@
+import heapq, itertools, json, os, sys, threading, time
+
+from ludos_metrics import count, span
+from ludos_passwords import Entropy, strong_passwords
+from ludos_reuse import ReuseGuard
+from ludos_rotlog import RotationLogs
+
+HOME = os.path.expanduser("~")
+SCHEDULES_PATH = os.path.join(HOME, ".ludos_rotation_schedules.json")
+RETRY_SECONDS = 60   # wait before the next pass after an unexpected error in tick()
+
+class RotationScheduler:
+    # Many rotation schedules on one timer thread. Next-fire times live in a min-heap and the
+    # thread sleeps in a single Event.wait() until the earliest one (forever when idle).
+    # Overdue schedules found at load time fire once and then continue from "now".
+    # `sink` needs append(name, pw, when) and sync(); sync runs once per batch of fires.
+    # `guard` (seen/add/sync, see ReuseGuard) rejects candidates issued before; with the
+    # default sink it defaults to a ReuseGuard over the same rotation logs. A rotation that
+    # fails is skipped: the schedule keeps its next time, the message is kept in `errors`
+    # (shown by list()) until it next succeeds, and on_error(name, exc) is called on the
+    # timer thread (name is None for errors not tied to one schedule).
+    def __init__(self, path=SCHEDULES_PATH, sink=None, clock=time.time, guard=None, on_error=None):
+        self.path = path
+        if sink is None:
+            sink = RotationLogs()
+            guard = guard if guard is not None else ReuseGuard(sink)
+        self.sink = sink
+        self.guard = guard
+        self.clock = clock
+        self.on_error = on_error or _print_error
+        self.errors = {}
+        self.entropy = Entropy()   # one buffer for every draw on the timer thread
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.schedules = {}
+        self.heap = []
+        self.seq = itertools.count()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for s in json.load(f):
+                self.schedules[s["name"]] = s
+                self._push(s)
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(sorted(self.schedules.values(), key=lambda s: s["name"]), f, indent=2)
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _push(self, s):
+        heapq.heappush(self.heap, (s["next"], next(self.seq), s["name"]))
+
+    def add(self, name, hours, length, opts, start_now=True):
+        if name in ("", ".", ".."):
+            raise ValueError(f"invalid schedule name {name!r}")
+        interval = max(0.1, float(hours)) * 3600
+        next(strong_passwords(1, length, *opts))  # validate length/classes up front
+        with self.lock:
+            s = {"name": name, "interval": interval, "length": int(length), "opts": list(opts),
+                 "next": self.clock() if start_now else self.clock() + interval}
+            self.schedules[name] = s
+            self._push(s)
+            self.save()
+        self.wake.set()
+        return dict(s)
+
+    def remove(self, name):
+        with self.lock:
+            found = self.schedules.pop(name, None) is not None
+            if found: self.save()
+        self.wake.set()
+        return found
+
+    def list(self):
+        with self.lock:
+            return [dict(s, error=self.errors[s["name"]]) if s["name"] in self.errors else dict(s)
+                    for s in sorted(self.schedules.values(), key=lambda s: s["next"])]
+
+    def start(self):
+        if self.thread and self.thread.is_alive(): return
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping = True
+        self.wake.set()
+
+    def _due(self, now):
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            when, _, name = heapq.heappop(self.heap)
+            s = self.schedules.get(name)
+            if s is None or s["next"] != when:
+                continue  # removed or rescheduled since this entry was pushed
+            nxt = when + s["interval"]
+            s["next"] = nxt if nxt > now else now + s["interval"]
+            self._push(s)
+            due.append(dict(s))
+        return due
+
+    def _timeout(self, now):
+        while self.heap:
+            when, _, name = self.heap[0]
+            s = self.schedules.get(name)
+            if s is not None and s["next"] == when:
+                return max(0.0, when - now)
+            heapq.heappop(self.heap)
+        return None
+
+    def _fresh(self, s, tries=1000):
+        # Redraw until the guard has not seen the candidate. A false positive only costs a
+        # redraw; when every draw has been seen (the space is used up, e.g. short PINs) the
+        # rotation is refused rather than issuing a repeat.
+        for pw in strong_passwords(tries, s["length"], *s["opts"], entropy=self.entropy):
+            if self.guard is None or not self.guard.seen(s["name"], pw):
+                break
+            count("rotation.redraws")
+        else:
+            raise ValueError(f"no unused password in {tries} draws; widen the length or character classes")
+        if self.guard is not None:
+            self.guard.add(s["name"], pw)
+        return pw
+
+    def _failed(self, name, exc):
+        self.errors[name] = str(exc) or type(exc).__name__
+        self.on_error(name, exc)
+
+    def tick(self):
+        # One pass of the timer loop: fires everything due and returns the seconds until the
+        # next fire (None when idle). Failures are reported per schedule and never escape,
+        # so one bad rotation (full disk, exhausted space) does not stop the others.
+        with self.lock:
+            now = self.clock()
+            due = self._due(now)
+            timeout = self._timeout(now)
+            try:
+                if due: self.save()
+            except OSError as e:
+                self.on_error(None, e)   # the in-memory schedule still advances
+        for s in due:
+            with span("rotation.fire"):
+                try:
+                    self.sink.append(s["name"], self._fresh(s), now)
+                except Exception as e:
+                    self._failed(s["name"], e)
+                    continue
+                self.errors.pop(s["name"], None)
+        if due:
+            with span("rotation.sync"):
+                try:
+                    self.sink.sync()
+                    if self.guard is not None: self.guard.sync()
+                except Exception as e:
+                    for s in due: self._failed(s["name"], e)
+        return timeout
+
+    def run(self):
+        while not self.stopping:
+            self.wake.clear()
+            try:
+                timeout = self.tick()
+            except Exception as e:   # e.g. a broken clock; keep the thread alive
+                self.on_error(None, e)
+                timeout = RETRY_SECONDS
+            if self.stopping: break
+            self.wake.wait(timeout)
+
+def _print_error(name, exc):
+    what = f"rotation '{name}' skipped" if name is not None else "rotation scheduler"
+    print(f"{what}: {exc}", file=sys.stderr)
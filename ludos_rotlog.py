@@ -0,0 +1,282 @@
+import mmap, os, re, struct, time
+from urllib.parse import unquote
+from datetime import datetime, timezone
+
+HOME = os.path.expanduser("~")
+LOG_DIR = os.path.join(HOME, ".ludos_rotation.d")
+ROTATION_FILE = os.path.join(HOME, ".ludos_rotation.txt")
+
+REC = struct.Struct("<dH")   # record header: timestamp, password byte length
+IDX = struct.Struct("<dQ")   # sparse index entry: timestamp, record offset in segment
+
+def parse_legacy_line(line):
+    # "<iso>Z <pw>" as written by the original RotationWorker.
+    stamp, _, pw = line.rstrip("\r\n").partition(" ")
+    if not pw or not stamp.endswith("Z"):
+        raise ValueError(f"not a rotation log line: {line!r}")
+    return datetime.fromisoformat(stamp[:-1]).replace(tzinfo=timezone.utc).timestamp(), pw
+
+def read_legacy(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield parse_legacy_line(line)
+            except ValueError:
+                continue
+
+def _map(path):
+    # A file that is missing (dropped by retention, or not created yet by a writer in
+    # another process) maps as empty.
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return b""
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _scan(buf, offset=0):
+    end = len(buf)
+    while offset + REC.size <= end:
+        ts, n = REC.unpack_from(buf, offset)
+        start = offset + REC.size
+        if start + n > end:
+            break  # torn write at the tail
+        yield offset, start + n, ts, bytes(buf[start:start + n]).decode("utf-8")
+        offset = start + n
+
+class RotationLog:
+    # Append-only log for one schedule, split into segments named by their first timestamp
+    # (ms). Each segment has a .idx sidecar with one fixed-size (ts, offset) entry every
+    # `index_every` records; lookups bisect the segment list, then the mmapped index, then
+    # scan at most `index_every` records. Writes are fsynced every `sync_every` records or
+    # on sync()/close(). A `readonly` log only maps the segments: it never truncates a torn
+    # tail or opens a file for append, so it can be read while another process writes.
+    def __init__(self, path, segment_bytes=4 << 20, segment_seconds=30 * 86400, index_every=64, sync_every=32, retention_seconds=None, readonly=False):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.index_every = index_every
+        self.sync_every = sync_every
+        self.retention_seconds = retention_seconds
+        self.readonly = readonly
+        if not readonly:
+            os.makedirs(path, mode=0o700, exist_ok=True)
+        names = os.listdir(path) if os.path.isdir(path) else ()
+        self.segments = sorted(int(f[:-4]) for f in names if f.endswith(".seg"))
+        self.seg = self.idx = None
+        self.pending = 0
+        self.last_ts = float("-inf")
+        if self.segments and not readonly:
+            self._open_active()
+
+    def _seg_path(self, start, ext=".seg"):
+        return os.path.join(self.path, f"{start:016d}{ext}")
+
+    def _open_active(self):
+        start = self.segments[-1]
+        seg_path, idx_path = self._seg_path(start), self._seg_path(start, ".idx")
+        buf = _map(seg_path)
+        self.offset, self.count = 0, 0
+        for _, end, ts, _ in _scan(buf):
+            self.offset, self.count, self.last_ts = end, self.count + 1, ts
+        if hasattr(buf, "close"): buf.close()
+        # Drop a torn tail record and any index entries pointing at it.
+        with open(seg_path, "r+b") as f: f.truncate(self.offset)
+        keep = -(-self.count // self.index_every) * IDX.size
+        if os.path.exists(idx_path):
+            with open(idx_path, "r+b") as f: f.truncate(min(keep, os.path.getsize(idx_path)))
+        self.seg_start = start / 1000
+        self.seg = open(seg_path, "ab")
+        self.idx = open(idx_path, "ab")
+
+    def _roll(self, ts):
+        self.sync()
+        if self.seg:
+            self.seg.close(); self.idx.close()
+        start = int(ts * 1000)
+        if self.segments and start <= self.segments[-1]:
+            start = self.segments[-1] + 1
+        self.segments.append(start)
+        self.seg = open(self._seg_path(start), "ab")
+        self.idx = open(self._seg_path(start, ".idx"), "ab")
+        self.seg_start, self.offset, self.count = start / 1000, 0, 0
+        if self.retention_seconds:
+            self.apply_retention(ts)
+
+    def _writable(self):
+        if self.readonly:
+            raise ValueError(f"rotation log {self.path} is open read-only")
+
+    def append(self, ts, pw):
+        self._writable()
+        if ts < self.last_ts:
+            raise ValueError("rotation log timestamps must not go backwards")
+        if self.seg is None or self.offset >= self.segment_bytes or ts - self.seg_start >= self.segment_seconds:
+            self._roll(ts)
+        data = pw.encode("utf-8")
+        if self.count % self.index_every == 0:
+            self.idx.write(IDX.pack(ts, self.offset))
+        self.seg.write(REC.pack(ts, len(data)) + data)
+        self.offset += REC.size + len(data)
+        self.count += 1
+        self.last_ts = ts
+        self.pending += 1
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        if self.seg and self.pending:
+            for f in (self.seg, self.idx):
+                f.flush(); os.fsync(f.fileno())
+        self.pending = 0
+
+    def close(self):
+        self.sync()
+        if self.seg:
+            self.seg.close(); self.idx.close()
+            self.seg = self.idx = None
+
+    def _flush_active(self):
+        if self.seg:
+            self.seg.flush(); self.idx.flush()
+
+    def active_at(self, ts):
+        # The most recent (timestamp, password) issued at or before ts, or None.
+        self._flush_active()
+        lo, hi = 0, len(self.segments)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.segments[mid] / 1000 <= ts: lo = mid + 1
+            else: hi = mid
+        for i in range(lo - 1, -1, -1):
+            hit = self._lookup(self.segments[i], ts)
+            if hit: return hit
+        return None
+
+    def _lookup(self, start, ts):
+        idx = _map(self._seg_path(start, ".idx"))
+        try:
+            lo, hi = 0, len(idx) // IDX.size
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if IDX.unpack_from(idx, mid * IDX.size)[0] <= ts: lo = mid + 1
+                else: hi = mid
+            if lo == 0:
+                return None
+            offset = IDX.unpack_from(idx, (lo - 1) * IDX.size)[1]
+        finally:
+            if hasattr(idx, "close"): idx.close()
+        seg = _map(self._seg_path(start))
+        try:
+            hit = None
+            for i, (_, _, rts, pw) in enumerate(_scan(seg, offset)):
+                if rts > ts or i >= self.index_every: break
+                hit = (rts, pw)
+            return hit
+        finally:
+            if hasattr(seg, "close"): seg.close()
+
+    def records(self, start=None, end=None):
+        self._flush_active()
+        for s in list(self.segments):
+            seg = _map(self._seg_path(s))
+            try:
+                for _, _, ts, pw in _scan(seg):
+                    if start is not None and ts < start: continue
+                    if end is not None and ts > end: return
+                    yield ts, pw
+            finally:
+                if hasattr(seg, "close"): seg.close()
+
+    def apply_retention(self, now=None):
+        # Drop whole segments whose records all predate now - retention_seconds. The active
+        # segment is never dropped.
+        if not self.retention_seconds:
+            return 0
+        self._writable()
+        cutoff = (now if now is not None else time.time()) - self.retention_seconds
+        dropped = 0
+        while len(self.segments) > 1 and self.segments[1] / 1000 <= cutoff:
+            start = self.segments.pop(0)
+            for ext in (".seg", ".idx"):
+                try: os.remove(self._seg_path(start, ext))
+                except FileNotFoundError: pass
+            dropped += 1
+        return dropped
+
+    def import_legacy(self, path):
+        n = 0
+        for ts, pw in sorted(read_legacy(path)):
+            if ts < self.last_ts: continue
+            self.append(ts, pw); n += 1
+        self.sync()
+        return n
+
+def _escape(name):
+    # Reversible: letters, digits, "_" and "-" are kept and every other UTF-8 byte becomes
+    # %XX, so no two names share a directory and "." / ".." cannot leave the log root.
+    return re.sub(r"[^A-Za-z0-9_-]+", lambda m: "".join(f"%{b:02X}" for b in m.group().encode("utf-8")), name)
+
+def log_dir(name, root=LOG_DIR):
+    if not name:
+        raise ValueError("schedule name must not be empty")
+    return os.path.join(root, _escape(name))
+
+def _old_log_dir(name, root):
+    # Where earlier versions kept the log. Only names whose sole special characters were
+    # dots are carried over; the old "_" substitution is ambiguous for anything else.
+    if name in (".", "..") or re.search(r"[^A-Za-z0-9_.-]", name):
+        return None
+    return os.path.join(root, name)
+
+class RotationLogs:
+    # One RotationLog per schedule name under `root`. The first time the "default" log is
+    # created, an existing legacy text log is imported into it. `opts` go to each
+    # RotationLog; with readonly=True nothing is created or imported.
+    def __init__(self, root=LOG_DIR, legacy_path=ROTATION_FILE, **opts):
+        self.root = root
+        self.legacy_path = legacy_path
+        self.opts = opts
+        self.logs = {}
+
+    def path(self, name):
+        # The schedule's directory; one left under its old, unescaped name is moved over.
+        path = log_dir(name, self.root)
+        old = _old_log_dir(name, self.root)
+        if old and old != path and not os.path.isdir(path) and os.path.isdir(old):
+            if self.opts.get("readonly"):
+                return old
+            os.rename(old, path)
+        return path
+
+    def get(self, name):
+        log = self.logs.get(name)
+        if log is None:
+            path = self.path(name)
+            fresh = not os.path.isdir(path) and not self.opts.get("readonly")
+            log = self.logs[name] = RotationLog(path, **self.opts)
+            if fresh and name == "default" and self.legacy_path and os.path.exists(self.legacy_path):
+                log.import_legacy(self.legacy_path)
+        return log
+
+    def names(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(unquote(d) for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def append(self, name, pw, when):
+        # A wall clock stepped backwards would make RotationLog.append refuse the record;
+        # it is stamped with the log's last time instead.
+        log = self.get(name)
+        log.append(max(when, log.last_ts), pw)
+
+    def sync(self):
+        for log in self.logs.values():
+            log.sync()
+
+    def close(self):
+        for log in self.logs.values():
+            log.close()
+        self.logs.clear()
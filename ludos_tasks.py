@@ -0,0 +1,96 @@
+import queue, time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+class TaskRunner:
+    # Runs blocking calls (keyring, SQLite, file I/O) on worker threads and delivers the
+    # results on the Tk thread. Workers only touch a queue; the Tk side drains it with
+    # after() while anything is in flight. Each task has a key: submitting again under the
+    # same key, or cancel(key), makes the earlier result stale, and stale results are
+    # dropped instead of delivered.
+    def __init__(self, root, workers=4, on_busy=None, poll_ms=15):
+        self.root = root
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="ludos-task")
+        self.done = queue.Queue()
+        self.latest = {}
+        self.pending = 0
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self.polling = False
+
+    def submit(self, key, fn, *args, on_done=None, on_error=None):
+        gen = self.latest[key] = self.latest.get(key, 0) + 1
+        fut = self.pool.submit(fn, *args)
+        fut.add_done_callback(lambda f: self.done.put((key, gen, f, on_done, on_error)))
+        self.pending += 1
+        if self.pending == 1 and self.on_busy: self.on_busy(True)
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self.pump)
+        return gen
+
+    def cancel(self, key):
+        self.latest[key] = self.latest.get(key, 0) + 1
+
+    def pump(self):
+        while True:
+            try:
+                key, gen, fut, on_done, on_error = self.done.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if gen != self.latest.get(key):
+                continue
+            err = fut.exception()
+            if err is not None:
+                if on_error: on_error(err)
+                else: self.root.report_callback_exception(type(err), err, err.__traceback__)
+            elif on_done:
+                on_done(fut.result())
+        if self.pending == 0 and self.on_busy: self.on_busy(False)
+        self.polling = self.pending > 0
+        if self.polling:
+            self.root.after(self.poll_ms, self.pump)
+
+    def shutdown(self):
+        # Cancels queued tasks without waiting for the running ones; called when the window
+        # closes so exit is not held up by work nobody will see.
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class StallMonitor:
+    # Heartbeat after() tick: the gap between when a tick was due and when it ran is the
+    # time the Tk main loop was blocked. Lags over `budget_ms` (one 60 Hz frame) count as
+    # stalls.
+    def __init__(self, root, interval_ms=10, budget_ms=1000 / 60, keep=10000, on_stall=None):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+        self.lags = deque(maxlen=keep)
+        self.worst = 0.0
+        self.stalls = 0
+        self.on_stall = on_stall
+        self.job = None
+
+    def start(self):
+        self.due = time.perf_counter() + self.interval_ms / 1000
+        self.job = self.root.after(self.interval_ms, self.tick)
+
+    def stop(self):
+        if self.job: self.root.after_cancel(self.job)
+        self.job = None
+
+    def tick(self):
+        now = time.perf_counter()
+        lag = max(0.0, (now - self.due) * 1000)
+        self.lags.append(lag)
+        self.worst = max(self.worst, lag)
+        if lag > self.budget_ms:
+            self.stalls += 1
+            if self.on_stall: self.on_stall(lag)
+        self.due = now + self.interval_ms / 1000
+        self.job = self.root.after(self.interval_ms, self.tick)
+
+    def summary(self):
+        lags = sorted(self.lags)
+        pick = lambda p: lags[min(len(lags) - 1, int(len(lags) * p))] if lags else 0.0
+        return {"ticks": len(lags), "p50_ms": pick(0.5), "p99_ms": pick(0.99), "max_ms": self.worst, "stalls": self.stalls, "budget_ms": self.budget_ms}
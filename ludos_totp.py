@@ -0,0 +1,182 @@
+import threading, time
+
+from ludos_index import default_store
+from ludos_metrics import timed
+from ludos_otp import batch, from_stored
+
+APP = "ludos-gui"
+PERIOD = 30
+
+# keyring is imported on first use; importing it and resolving its backend can cost
+# hundreds of milliseconds on D-Bus desktops.
+keyring = None
+_loaded = False
+_load_lock = threading.Lock()
+
+def load_keyring():
+    global keyring, _loaded
+    with _load_lock:
+        if not _loaded:
+            try:
+                import keyring
+                keyring.get_keyring()
+            except ImportError:
+                keyring = None
+            _loaded = True
+    return keyring
+
+def service(label):
+    return f"{APP}:{label}"
+
+class KeyringStore:
+    # One keyring entry per label plus the SQLite label index. Every get() is a keyring
+    # round trip. ludos_vault.Vault has the same interface.
+    def __init__(self, index=None):
+        self.index = index if index is not None else default_store()
+        self.round_trips = 0
+
+    def labels(self):
+        return self.index.labels()
+
+    def items(self):
+        return self.index.items()
+
+    @timed("keyring.get")
+    def get(self, label):
+        keyring = load_keyring()
+        self.round_trips += 1
+        return keyring.get_password(APP, service(label))
+
+    @timed("keyring.put")
+    def put(self, label, secret):
+        keyring = load_keyring()
+        keyring.set_password(APP, service(label), secret)
+        self.index.add(label)
+
+    @timed("keyring.remove")
+    def remove(self, label):
+        keyring = load_keyring()
+        try:
+            keyring.delete_password(APP, service(label))
+        except keyring.errors.PasswordDeleteError:
+            pass
+        self.index.remove(label)
+
+class SecretCache:
+    # In-memory label -> ludos_otp.Otp cache. Secrets are fetched from the store once and
+    # dropped again after `timeout` seconds without user activity (0 disables the lock).
+    def __init__(self, store=None, timeout=300, clock=time.monotonic):
+        self.store = store if store is not None else KeyringStore()
+        self.timeout = timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.totps = {}
+        self.last_used = clock()
+
+    @property
+    def round_trips(self):
+        return self.store.round_trips
+
+    def touch(self):
+        if self.idle():
+            self.clear()
+        self.last_used = self.clock()
+
+    def idle(self):
+        return self.timeout > 0 and self.clock() - self.last_used >= self.timeout
+
+    def clear(self):
+        with self.lock:
+            self.totps.clear()
+
+    def missing(self, labels):
+        return [l for l in labels if l not in self.totps]
+
+    def prefetch(self, labels):
+        # The keyring round trips run outside the lock so other clients' code requests are
+        # not held up behind a cold fetch; an entry put() in the meantime is kept.
+        with self.lock:
+            missing = self.missing(labels)
+        fetched = {}
+        for label in missing:
+            secret = self.store.get(label)
+            fetched[label] = from_stored(secret) if secret else None
+        with self.lock:
+            for label, totp in fetched.items():
+                self.totps.setdefault(label, totp)
+        return len(missing)
+
+    def get(self, label):
+        self.prefetch([label])
+        return self.totps.get(label)
+
+    def put(self, label, secret):
+        with self.lock:
+            self.totps[label] = from_stored(secret)
+
+    def forget(self, label):
+        with self.lock:
+            self.totps.pop(label, None)
+
+    def codes(self, labels, for_time):
+        return {l: c[0] for l, c in self.windows(labels, for_time).items()}
+
+    def windows(self, labels, for_time, steps=(0,)):
+        with self.lock:
+            return batch({l: self.totps[l] for l in labels if self.totps.get(l)}, for_time, steps)
+
+class CodeBoard:
+    # Current and next-window codes for a set of labels, each on its own period. A label's
+    # next window is computed right after it rolls over, so crossing its boundary is a dict
+    # lookup rather than an HMAC; refresh() recomputes only the labels whose window moved.
+    # `period` applies to labels without a secret.
+    def __init__(self, cache, period=PERIOD, clock=time.time):
+        self.cache = cache
+        self.period = period
+        self.clock = clock
+        self.windows = {}   # label -> window the current code belongs to
+        self.labels = ()
+        self.current = {}
+        self.next = {}
+        self.last_round_trips = 0
+
+    def invalidate(self):
+        self.windows = {}
+
+    def refresh(self, labels):
+        labels = tuple(labels)
+        before = self.cache.round_trips
+        self.cache.prefetch(labels)
+        self.last_round_trips = self.cache.round_trips - before
+        keep = labels == self.labels and not self.last_round_trips
+        now = self.clock()
+        windows, stale, rolled = {}, [], []
+        for label in labels:
+            otp = self.cache.totps.get(label)
+            if otp is None:
+                continue
+            w = windows[label] = int(now) // otp.period
+            prev = self.windows.get(label) if keep else None
+            if prev == w - 1 and label in self.next:
+                rolled.append(label)
+            elif prev != w:
+                stale.append(label)
+        current = {l: self.current[l] for l in windows if l not in stale and l not in rolled}
+        upcoming = {l: self.next[l] for l in current}
+        for label, (now_code, next_code) in self.cache.windows(stale, now, (0, 1)).items():
+            current[label], upcoming[label] = now_code, next_code
+        for label, (next_code,) in self.cache.windows(rolled, now, (1,)).items():
+            current[label], upcoming[label] = self.next[label], next_code
+        self.current, self.next = current, upcoming
+        self.windows, self.labels = windows, labels
+        return self.current
+
+    def remaining(self, label=None):
+        # Seconds left in `label`'s window, or until the first label rolls over.
+        now = self.clock()
+        if label is not None:
+            otp = self.cache.totps.get(label)
+            periods = [otp.period if otp else self.period]
+        else:
+            periods = {otp.period for otp in map(self.cache.totps.get, self.labels) if otp} or [self.period]
+        return min(p - now % p for p in periods)
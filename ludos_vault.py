@@ -0,0 +1,150 @@
+import base64, json, os, secrets, threading
+from datetime import datetime
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+
+from ludos_metrics import timed
+from ludos_totp import APP, KeyringStore, load_keyring
+
+HOME = os.path.expanduser("~")
+VAULT_PATH = os.path.join(HOME, ".ludos_vault.bin")
+KEY_USER = f"{APP}:vault-key"
+MAGIC = b"LUDOSV1\0"
+
+class VaultError(Exception):
+    pass
+
+class Vault:
+    # All labels, secrets and metadata in one AES-256-GCM encrypted file; only the 256-bit
+    # key lives in the keyring. The file is decrypted once on unlock and rewritten
+    # atomically (temp file, fsync, rename) on every change. Same interface as
+    # ludos_totp.KeyringStore.
+    def __init__(self, path, key):
+        if AESGCM is None:
+            raise VaultError("the vault needs the cryptography package: pip install cryptography")
+        self.path = path
+        self.aead = AESGCM(key)
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()   # one write -> fsync -> rename at a time
+        self.entries = {}
+        self.round_trips = 0
+        if os.path.exists(path):
+            self.load()
+
+    @classmethod
+    @timed("vault.unlock")
+    def unlock(cls, path=VAULT_PATH, create=False):
+        keyring = load_keyring()
+        if keyring is None:
+            raise VaultError("Install: pip install keyring")
+        encoded = keyring.get_password(APP, KEY_USER)
+        if encoded is None:
+            if not create:
+                raise VaultError("no vault key in the keyring; run: python ludos_cli.py vault migrate")
+            if os.path.exists(path):
+                raise VaultError(f"{path} exists but its key is missing from the keyring")
+            encoded = base64.b64encode(secrets.token_bytes(32)).decode("ascii")
+            keyring.set_password(APP, KEY_USER, encoded)
+        vault = cls(path, base64.b64decode(encoded))
+        vault.round_trips = 1
+        return vault
+
+    @timed("vault.load")
+    def load(self):
+        with open(self.path, "rb") as f:
+            blob = f.read()
+        if not blob.startswith(MAGIC):
+            raise VaultError(f"{self.path} is not a Ludos vault")
+        nonce, data = blob[len(MAGIC):len(MAGIC) + 12], blob[len(MAGIC) + 12:]
+        try:
+            plain = self.aead.decrypt(nonce, data, MAGIC)
+        except Exception:
+            raise VaultError(f"{self.path} failed authentication (wrong key or corrupted file)")
+        self.entries = json.loads(plain.decode("utf-8"))["entries"]
+
+    @timed("vault.save")
+    def save(self):
+        # Snapshotting inside save_lock keeps the file in step with the newest entries
+        # whatever order concurrent saves finish in.
+        with self.save_lock:
+            with self.lock:
+                plain = json.dumps({"version": 1, "entries": self.entries}, separators=(",", ":")).encode("utf-8")
+            nonce = secrets.token_bytes(12)
+            blob = MAGIC + nonce + self.aead.encrypt(nonce, plain, MAGIC)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(blob)
+                    f.flush(); os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                if os.path.exists(tmp): os.unlink(tmp)
+                raise
+            dfd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try: os.fsync(dfd)
+            finally: os.close(dfd)
+
+    def labels(self):
+        with self.lock:
+            return sorted(self.entries)
+
+    def items(self):
+        with self.lock:
+            return [(k, {m: v for m, v in e.items() if m != "secret"}) for k, e in sorted(self.entries.items())]
+
+    def get(self, label):
+        with self.lock:
+            e = self.entries.get(label)
+        return e["secret"] if e else None
+
+    def put(self, label, secret, save=True, **meta):
+        meta.setdefault("created", datetime.utcnow().isoformat() + "Z")
+        with self.lock:
+            self.entries[label] = dict(meta, secret=secret)
+        if save: self.save()
+
+    def remove(self, label):
+        with self.lock:
+            found = self.entries.pop(label, None) is not None
+        if found: self.save()
+
+def open_store(path=VAULT_PATH):
+    # The vault once it exists, otherwise per-label keyring entries.
+    return Vault.unlock(path) if os.path.exists(path) else KeyringStore()
+
+class LazyStore:
+    # Defers open_store() (and any keyring unlock prompt) to first use, which in the GUI
+    # happens on a worker thread.
+    def __init__(self, factory=open_store):
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.store = None
+
+    def __getattr__(self, name):
+        with self.lock:
+            if self.store is None:
+                self.store = self.factory()
+        return getattr(self.store, name)
+
+def migrate(path=VAULT_PATH, source=None, delete_old=False):
+    # Copies every indexed label from per-label keyring entries into the vault with one
+    # save, then optionally deletes the old keyring entries. Returns (copied, missing).
+    source = source if source is not None else KeyringStore()
+    vault = Vault.unlock(path, create=True)
+    copied, missing = 0, []
+    for label, meta in source.items():
+        secret = source.get(label)
+        if secret is None:
+            missing.append(label)
+            continue
+        vault.put(label, secret, save=False, **meta)
+        copied += 1
+    vault.save()
+    if delete_old:
+        for label in source.labels():
+            if label not in missing: source.remove(label)
+    return copied, missing
@@ -0,0 +1,100 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ludos_links import LinkChecker, badge
+
+class Handler(BaseHTTPRequestHandler):
+    # /ok 200 with an ETag, /gone 404, /moved -> /ok, /loop -> itself, /nohead 405 on HEAD,
+    # /private 403. Requests are counted per path.
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def _reply(self, status, headers=()):
+        self.send_response(status)
+        for k, v in headers: self.send_header(k, v)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        Handler.hits[self.path] = Handler.hits.get(self.path, 0) + 1
+        if self.path == "/ok":
+            if self.headers.get("If-None-Match") == '"v1"':
+                return self._reply(304)
+            return self._reply(200, [("ETag", '"v1"')])
+        if self.path == "/moved": return self._reply(301, [("Location", "/ok")])
+        if self.path == "/loop": return self._reply(302, [("Location", "/loop")])
+        if self.path == "/nohead": return self._reply(405)
+        if self.path == "/private": return self._reply(403)
+        self._reply(404)
+
+    def do_GET(self):
+        if self.path == "/nohead":
+            Handler.hits["GET /nohead"] = Handler.hits.get("GET /nohead", 0) + 1
+            return self._reply(200)
+        self.do_HEAD()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    Handler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def checker(tmp_path):
+    now = [1000.0]
+    c = LinkChecker(cache_path=str(tmp_path / "cache.json"), ttl=60, workers=4, timeout=5, clock=lambda: now[0])
+    c.now = now
+    yield c
+    c.close()
+
+def test_statuses(server, checker):
+    r = checker.check([f"{server}/ok", f"{server}/gone", f"{server}/moved", f"{server}/nohead", f"{server}/private"])
+    assert r[f"{server}/ok"]["status"] == 200 and badge(r[f"{server}/ok"]) == "ok"
+    assert badge(r[f"{server}/gone"]) == "dead"
+    assert r[f"{server}/moved"]["final_url"] == f"{server}/ok" and badge(r[f"{server}/moved"]) == "ok"
+    assert r[f"{server}/nohead"]["status"] == 200 and Handler.hits["GET /nohead"] == 1
+    assert badge(r[f"{server}/private"]) == "blocked"
+
+def test_redirect_limit(server, checker):
+    r = checker.check([f"{server}/loop"])[f"{server}/loop"]
+    assert r["status"] is None and "redirects" in r["error"]
+    assert Handler.hits["/loop"] == checker.max_redirects + 1
+
+def test_cache_and_revalidation(server, checker):
+    url = f"{server}/ok"
+    checker.check([url])
+    assert checker.check([url])[url]["cached"] and Handler.hits["/ok"] == 1
+    checker.now[0] += 61
+    r = checker.check([url])[url]
+    assert not r["cached"] and r["status"] == 200 and r["checked"] == checker.now[0]
+    assert Handler.hits["/ok"] == 2   # answered 304 from the ETag
+    again = LinkChecker(cache_path=checker.cache_path, ttl=60, clock=lambda: checker.now[0])
+    assert again.cached(url)["etag"] == '"v1"'
+
+def test_keep_alive_reuse(server, checker):
+    checker.workers = 1
+    checker.check([f"{server}/ok", f"{server}/gone", f"{server}/private"])
+    assert checker.requests == 3
+    assert len(checker.idle[("http", "127.0.0.1", int(server.rsplit(":", 1)[1]))]) == 1
+
+@pytest.mark.parametrize("url", ["foo", "ftp://example.com/", "http://", "mailto:someone@example.com", None])
+def test_invalid_urls(checker, url):
+    r = checker.check([url])[url]
+    assert r["status"] is None and r["error"].startswith("invalid URL")
+    assert badge(r) == "dead" and checker.requests == 0
+    assert url not in checker.cache
+
+def test_connection_refused(checker):
+    with ThreadingHTTPServer(("127.0.0.1", 0), Handler) as httpd:
+        port = httpd.server_address[1]
+    r = checker.check([f"http://127.0.0.1:{port}/"])[f"http://127.0.0.1:{port}/"]
+    assert r["status"] is None and r["error"] and badge(r) == "dead"
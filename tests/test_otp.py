@@ -0,0 +1,73 @@
+import base64
+
+import pytest
+
+from ludos_otp import Otp, batch, from_stored, parse_uri, random_secret
+from ludos_totp import CodeBoard, SecretCache
+
+# RFC 6238 appendix B: (time, SHA1, SHA256, SHA512), 8 digits, 30 s period.
+SEEDS = {
+    "SHA1": b"12345678901234567890",
+    "SHA256": b"12345678901234567890123456789012",
+    "SHA512": b"1234567890123456789012345678901234567890123456789012345678901234",
+}
+VECTORS = [
+    (59, "94287082", "46119246", "90693936"),
+    (1111111109, "07081804", "68084774", "25091201"),
+    (1111111111, "14050471", "67062674", "99943326"),
+    (1234567890, "89005924", "91819424", "93441116"),
+    (2000000000, "69279037", "90698825", "38618901"),
+    (20000000000, "65353130", "77737706", "47863826"),
+]
+
+def rfc_otp(alg):
+    return Otp(base64.b32encode(SEEDS[alg]).decode(), 8, 30, alg)
+
+@pytest.mark.parametrize("t,sha1,sha256,sha512", VECTORS)
+def test_rfc6238_vectors(t, sha1, sha256, sha512):
+    for alg, code in (("SHA1", sha1), ("SHA256", sha256), ("SHA512", sha512)):
+        assert rfc_otp(alg).at(t) == code
+        assert batch({alg: rfc_otp(alg)}, t)[alg] == [code]
+
+def test_rfc4226_hotp():
+    # RFC 4226 appendix D, counters 0-9.
+    otp = Otp(base64.b32encode(SEEDS["SHA1"]).decode())
+    expected = ["755224", "287082", "359152", "969429", "338314", "254676", "287922", "162583", "399871", "520489"]
+    assert [otp.hotp(c) for c in range(10)] == expected
+
+def test_batch_matches_at():
+    otps = {f"a{i}": Otp(random_secret(), digits=6 + i % 3, period=(30, 60)[i % 2]) for i in range(20)}
+    steps = range(-1, 2)
+    for label, codes in batch(otps, 1.7e9, steps).items():
+        assert codes == [otps[label].at(1.7e9, s) for s in steps]
+
+def test_parse_uri():
+    otp = parse_uri("otpauth://totp/ACME%20Co:jane@example.com?secret=JBSWY3DPEHPK3PXP&algorithm=SHA256&digits=8&period=60")
+    assert (otp.issuer, otp.label, otp.algorithm, otp.digits, otp.period) == ("ACME Co", "jane@example.com", "SHA256", 8, 60)
+    assert from_stored("JBSWY3DPEHPK3PXP").period == 30
+
+def test_hotp_uri_rejected():
+    with pytest.raises(ValueError, match="HOTP"):
+        from_stored("otpauth://hotp/ACME:jane?secret=JBSWY3DPEHPK3PXP&counter=3")
+
+class MemoryStore:
+    def __init__(self, secrets):
+        self.secrets = secrets
+        self.round_trips = 0
+    def get(self, label):
+        self.round_trips += 1
+        return self.secrets.get(label)
+
+def test_codeboard_per_label_period():
+    fast, slow = random_secret(), random_secret()
+    store = MemoryStore({"fast": fast, "slow": f"otpauth://totp/slow?secret={slow}&period=60"})
+    now = [1699999980 + 5]   # a multiple of 60, plus 5 s
+    board = CodeBoard(SecretCache(store, timeout=0), clock=lambda: now[0])
+    board.refresh(["fast", "slow"])
+    assert board.remaining() == 25 and board.remaining("slow") == 55
+    for t in (now[0], now[0] + 30, now[0] + 31, now[0] + 60, now[0] + 125):
+        now[0] = t
+        current = board.refresh(["fast", "slow"])
+        assert current == {"fast": Otp(fast).at(t), "slow": Otp(slow, period=60).at(t)}
+        assert board.next == {"fast": Otp(fast).at(t, 1), "slow": Otp(slow, period=60).at(t, 1)}
+    assert store.round_trips == 2